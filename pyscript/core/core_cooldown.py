@@ -0,0 +1,166 @@
+# --*utf-8*--
+# Author：一念断星河
+# Crete Data：2026/10/19
+# Desc：不过是大梦一场空，不过是孤影照惊鸿。
+# 冷却倒计时: 只记录正在倒计时的定时器, 重置、暂停、查询和每帧更新都只处理这些
+from .functor import CFunctor
+
+
+class Cooldown:
+    def __init__(self, serial, totalMs, tickFunc, endFunc, bCycle):
+        self.m_Serial = serial
+        self.m_fTotalMs = totalMs
+        self.m_fRemainMs = totalMs
+        self.m_bCycle = bCycle  # 循环: 倒计时结束后重新开始, 不会移出
+        self.m_bPause = False
+        self.m_fNextMs = None  # 剩余时间低于该值时才再次回调, None为每帧回调
+        self.m_TickFunc = CFunctor(tickFunc) if tickFunc else None  # tickFunc(剩余毫秒) -> 下次回调的剩余时间
+        self.m_EndFunc = CFunctor(endFunc) if endFunc else None
+
+
+class CooldownMgr:
+    def __init__(self):
+        self.m_Serial = 0
+        self.m_dActive = {}  # key -> 正在倒计时的冷却
+        self.m_fTimeMs = 0  # 累计的更新时间, 各定时器按它对齐动画帧
+
+    def Start(self, key, totalMs, tickFunc=None, endFunc=None, bCycle=False):
+        # 同一个key重新开始时覆盖之前的冷却
+        self.m_Serial += 1
+        self.m_dActive[key] = Cooldown(self.m_Serial, totalMs, tickFunc, endFunc, bCycle)
+        return self.m_Serial
+
+    def Stop(self, key, serial=None):
+        # 结束冷却, 不触发结束回调; serial 不为None时只结束对应的那一次
+        cooldown = self.m_dActive.get(key, None)
+        if not cooldown:
+            return
+        if serial is not None and cooldown.m_Serial != serial:
+            return
+        del self.m_dActive[key]
+
+    def Reset(self, key):
+        # 重新开始倒计时
+        cooldown = self.m_dActive.get(key, None)
+        if cooldown:
+            cooldown.m_fRemainMs = cooldown.m_fTotalMs
+            cooldown.m_fNextMs = None
+
+    def Wake(self, key):
+        # 显示格式变化后下一帧立即回调
+        cooldown = self.m_dActive.get(key, None)
+        if cooldown:
+            cooldown.m_fNextMs = None
+
+    def Pause(self, key, bPause=True):
+        cooldown = self.m_dActive.get(key, None)
+        if cooldown:
+            cooldown.m_bPause = bPause
+
+    def IsActive(self, key):
+        return key in self.m_dActive
+
+    def IsPause(self, key):
+        cooldown = self.m_dActive.get(key, None)
+        return bool(cooldown and cooldown.m_bPause)
+
+    def GetRemain(self, key):
+        # 剩余毫秒, 不在冷却中返回0
+        cooldown = self.m_dActive.get(key, None)
+        return cooldown.m_fRemainMs if cooldown else 0
+
+    def GetActive(self):
+        return list(self.m_dActive.keys())
+
+    def GetTimeMs(self):
+        return self.m_fTimeMs
+
+    def update(self, deltaTimeMs):
+        self.m_fTimeMs += deltaTimeMs
+        for key, cooldown in list(self.m_dActive.items()):
+            if cooldown.m_bPause or self.m_dActive.get(key, None) is not cooldown:
+                continue
+            cooldown.m_fRemainMs -= deltaTimeMs
+            if cooldown.m_fRemainMs <= 0:
+                if not cooldown.m_bCycle or cooldown.m_fTotalMs <= 0:
+                    del self.m_dActive[key]
+                    if cooldown.m_EndFunc:
+                        cooldown.m_EndFunc()
+                    continue
+                cooldown.m_fRemainMs += cooldown.m_fTotalMs
+                cooldown.m_fNextMs = None
+            if not cooldown.m_TickFunc:
+                continue
+            # 显示精度决定回调频率: 显示没有变化前不回调
+            if cooldown.m_fNextMs is not None and cooldown.m_fRemainMs >= cooldown.m_fNextMs:
+                continue
+            cooldown.m_fNextMs = cooldown.m_TickFunc(cooldown.m_fRemainMs)
+
+
+class Cooldown_Ref:
+    def __init__(self, key, serial):
+        self.m_Key = key
+        self.m_Serial = serial
+
+    def __del__(self):
+        if g_Instance:
+            g_Instance.Stop(self.m_Key, self.m_Serial)
+
+
+if "g_Instance" not in globals():
+    g_Instance = CooldownMgr()
+
+
+def Initialize():
+    pass
+
+
+def StartCooldown(key, totalMs, tickFunc=None, endFunc=None, bCycle=False):
+    """
+    开始冷却倒计时
+    :param key: 冷却的key, 如定时器uid
+    :param totalMs: 冷却时间 MS
+    :param tickFunc: 每帧回调, 参数为剩余毫秒; 返回剩余时间低于多少时再回调, 返回None为每帧回调
+    :param endFunc: 倒计时结束回调(循环冷却不会结束)
+    :param bCycle: 是否循环
+    :return: 引用被释放时冷却自动结束
+    """
+    serial = g_Instance.Start(key, totalMs, tickFunc, endFunc, bCycle)
+    return Cooldown_Ref(key, serial)
+
+
+def ResetCooldown(key):
+    """
+    重新开始倒计时, 不触发结束回调
+    """
+    g_Instance.Reset(key)
+
+
+def PauseCooldown(key, bPause=True):
+    """
+    暂停或继续倒计时, 暂停期间每帧更新会跳过
+    """
+    g_Instance.Pause(key, bPause)
+
+
+def GetCooldownRemain(key):
+    """
+    :return: 剩余毫秒, 不在冷却中返回0
+    """
+    return g_Instance.GetRemain(key)
+
+
+def UpdateCooldown(deltaTimeMs):
+    g_Instance.update(deltaTimeMs)
+
+
+# ------------------- api --------------------
+Stop = g_Instance.Stop
+Reset = g_Instance.Reset
+Wake = g_Instance.Wake
+Pause = g_Instance.Pause
+IsActive = g_Instance.IsActive
+IsPause = g_Instance.IsPause
+GetRemain = g_Instance.GetRemain
+GetActive = g_Instance.GetActive
+GetTimeMs = g_Instance.GetTimeMs
@@ -0,0 +1,129 @@
+# --*utf-8*--
+# Author：一念断星河
+# Crete Data：2026/10/19
+# Desc：不过是大梦一场空，不过是孤影照惊鸿。
+# sqlite 存档后端: 每个配置文件对应 config 表中 path 相同的一组行, 每行一个配置项
+import json
+import os
+import sqlite3
+import threading
+
+
+class ProfileDB:
+	def __init__(self, path):
+		path_dir = os.path.dirname(path)
+		if path_dir and not os.path.exists(path_dir):
+			os.makedirs(path_dir)
+		self.m_Path = path
+		self.m_oLock = threading.Lock()  # 连接允许跨线程使用, 同一时间只能有一个线程访问
+		self.m_Conn = sqlite3.connect(path, check_same_thread=False)
+		self.m_Conn.execute("PRAGMA journal_mode=WAL")
+		self.m_Conn.execute("PRAGMA synchronous=NORMAL")
+		self.m_Conn.executescript("""
+			CREATE TABLE IF NOT EXISTS config (
+				path TEXT NOT NULL,
+				key TEXT NOT NULL,
+				name TEXT,
+				group_id INTEGER,
+				open INTEGER,
+				data TEXT NOT NULL,
+				PRIMARY KEY (path, key)
+			);
+			CREATE INDEX IF NOT EXISTS idx_config_group ON config (path, group_id);
+			CREATE INDEX IF NOT EXISTS idx_config_open ON config (path, open);
+			CREATE TABLE IF NOT EXISTS imported (path TEXT PRIMARY KEY);
+		""")
+		self.m_Conn.commit()
+		self.m_Imported = set(row[0] for row in self.m_Conn.execute("SELECT path FROM imported"))
+
+	@staticmethod
+	def _MakeRow(path, key, value):
+		# 定时器/分组的名字、分组、开关单独存一列, 用于索引和懒加载
+		if isinstance(value, dict):
+			name = value.get("sName", None)
+			group_id = value.get("groupId", None)
+			bOpen = int(bool(value.get("bOpen", False)))
+		else:
+			name, group_id, bOpen = None, None, None
+		return path, str(key), name, group_id, bOpen, json.dumps(value, ensure_ascii=False)
+
+	def IsImported(self, path):
+		return path in self.m_Imported
+
+	def ImportDoc(self, path, data):
+		# 首次使用时把json存档导入数据库
+		self.SaveDoc(path, data)
+		with self.m_oLock:
+			self.m_Conn.execute("INSERT OR IGNORE INTO imported (path) VALUES (?)", (path,))
+			self.m_Conn.commit()
+		self.m_Imported.add(path)
+
+	def LoadDoc(self, path):
+		with self.m_oLock:
+			cur = self.m_Conn.execute("SELECT key, data FROM config WHERE path=?", (path,))
+			return {key: json.loads(data) for key, data in cur.fetchall()}
+
+	def LoadItem(self, path, key):
+		with self.m_oLock:
+			cur = self.m_Conn.execute("SELECT data FROM config WHERE path=? AND key=?", (path, str(key)))
+			row = cur.fetchone()
+		return json.loads(row[0]) if row else None
+
+	def LoadLazy(self, path):
+		"""
+		开启的配置项完整读取, 关闭的只读取名字、分组、开关
+		:return: (完整数据, 摘要数据)
+		"""
+		with self.m_oLock:
+			cur = self.m_Conn.execute("SELECT key, data FROM config WHERE path=? AND open=1", (path,))
+			data = {key: json.loads(value) for key, value in cur.fetchall()}
+			cur = self.m_Conn.execute("SELECT key, name, group_id FROM config WHERE path=? AND open=0", (path,))
+			lazy = {}
+			for key, name, group_id in cur.fetchall():
+				lazy[key] = {"sName": name, "groupId": group_id, "bOpen": False}
+		return data, lazy
+
+	def SaveDoc(self, path, data):
+		with self.m_oLock:
+			with self.m_Conn:
+				self.m_Conn.execute("DELETE FROM config WHERE path=?", (path,))
+				self.m_Conn.executemany(
+					"INSERT INTO config (path, key, name, group_id, open, data) VALUES (?, ?, ?, ?, ?, ?)",
+					[self._MakeRow(path, key, value) for key, value in data.items()])
+
+	def SaveValue(self, path, key, value):
+		with self.m_oLock:
+			with self.m_Conn:
+				self.m_Conn.execute(
+					"INSERT OR REPLACE INTO config (path, key, name, group_id, open, data) VALUES (?, ?, ?, ?, ?, ?)",
+					self._MakeRow(path, key, value))
+
+	def SaveField(self, path, key, fields):
+		info = self.LoadItem(path, key) or {}
+		info.update(fields)
+		self.SaveValue(path, key, info)
+
+	def SaveItems(self, path, items, lDelete=()):
+		"""
+		批量写入和删除配置项, 在同一个事务中完成
+		:param items: {key: 配置项}
+		:param lDelete: 要删除的key
+		"""
+		with self.m_oLock:
+			with self.m_Conn:
+				if items:
+					self.m_Conn.executemany(
+						"INSERT OR REPLACE INTO config (path, key, name, group_id, open, data) VALUES (?, ?, ?, ?, ?, ?)",
+						[self._MakeRow(path, key, value) for key, value in items.items()])
+				if lDelete:
+					self.m_Conn.executemany(
+						"DELETE FROM config WHERE path=? AND key=?", [(path, str(key)) for key in lDelete])
+
+	def DeleteKey(self, path, key):
+		with self.m_oLock:
+			with self.m_Conn:
+				self.m_Conn.execute("DELETE FROM config WHERE path=? AND key=?", (path, str(key)))
+
+	def Close(self):
+		with self.m_oLock:
+			self.m_Conn.close()
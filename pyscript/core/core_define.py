@@ -10,6 +10,18 @@ Path_Timer = "resources/config/timers.json"
 Path_Group = "resources/config/group.json"
 Path_Voice = "resources/config/voice.json"
 Path_Icon = "resources/icon/icon.png"
+Path_DB = "resources/config/profile.db"
+Path_ProfileRoot = "resources/config/profiles"
+
+# 按配置方案分别保存的配置, 其他配置(设置、语音)所有方案共用
+ProfilePaths = (Path_Timer, Path_Group)
+
+# 存档后端: "json" 每个配置一个json文件; "sqlite" 所有配置存在 Path_DB 中, 按行增量读写
+# 打包时选择, 不作为设置项: 设置本身也通过后端读写, 运行中切换会丢失另一个后端里的改动
+StorageBackend = "json"
+
+# 以日志模式保存的配置: 改动追加到日志, 定期合并进快照
+JournalPaths = (Path_Timer, Path_Group)
 
 OpenAEJump = False
 
@@ -25,3 +37,10 @@ class SettingName:
     AEJumpTime2 = "ae_jump_time2"  # 腾空落地时间
     AEJumpTime3 = "ae_jump_time3"  # 落地重新起跳时间
     AEJumpKey = "ae_jump_key"  # 艾尔跳跃
+    Profile = "profile"  # 当前配置方案
+    RecentProfiles = "recent_profiles"  # 最近使用的配置方案, 后台预加载
+    OverlayMode = "overlay_mode"  # 所有定时器画在每个屏幕一个的透明窗口上
+    SweepFps = "sweep_fps"  # 图标定时器冷却扫描动画的帧率, 0为关闭
+    EngineTickMs = "engine_tick_ms"  # 热键和倒计时的逻辑更新间隔
+    RenderFps = "render_fps"  # 渲染帧率上限, 不超过屏幕刷新率
+    IdleSuspendSec = "idle_suspend_sec"  # 多久没有操作后暂停装饰动画(秒), 0为不按空闲暂停
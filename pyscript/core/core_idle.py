@@ -0,0 +1,97 @@
+# --*utf-8*--
+# Author：一念断星河
+# Crete Data：2026/10/19
+# Desc：不过是大梦一场空，不过是孤影照惊鸿。
+# 空闲和可见性检测: 锁屏、窗口看不到或长时间没有操作时暂停纯装饰的动画(宠物动画、冷却扫描)
+# 倒计时照常进行; 有键盘或鼠标操作、窗口重新可见时恢复
+import sys
+import time
+
+from PySide6.QtCore import QTimer, QPoint, Qt
+from PySide6.QtGui import QCursor
+
+from core import core_event, core_input, core_setting
+from core.core_define import SettingName
+from .functor import CFunctor
+
+PollMs = 250  # 检测间隔, 也是有操作后恢复动画的最大延迟
+
+if sys.platform == "win32":
+    import ctypes
+
+    g_User32 = ctypes.windll.user32
+    g_User32.OpenInputDesktop.restype = ctypes.c_void_p
+    g_User32.CloseDesktop.argtypes = [ctypes.c_void_p]
+else:
+    g_User32 = None
+
+
+def IsScreenLocked():
+    # 锁屏时输入桌面切换到安全桌面, 普通进程无法打开
+    if not g_User32:
+        return False
+    hDesk = g_User32.OpenInputDesktop(0, False, 0x0100)  # DESKTOP_SWITCHDESKTOP
+    if not hDesk:
+        return True
+    g_User32.CloseDesktop(hDesk)
+    return False
+
+
+class IdleMgr:
+    def __init__(self):
+        self.m_bSuspend = False
+        self.m_Timer = None
+        self.m_CursorPos = QPoint()
+        self.m_fLastInput = time.time()
+        self.m_lVisible = []  # 窗口可见性检测, 全部返回False时认为看不到
+
+    def Start(self):
+        if self.m_Timer:
+            return
+        self.m_Timer = QTimer()
+        self.m_Timer.setTimerType(Qt.CoarseTimer)
+        self.m_Timer.timeout.connect(self._Check)
+        self.m_Timer.start(PollMs)
+
+    def AddVisibleCheck(self, func):
+        self.m_lVisible.append(CFunctor(func))
+
+    def IsSuspend(self):
+        return self.m_bSuspend
+
+    def _IsVisible(self):
+        if IsScreenLocked():
+            return False
+        self.m_lVisible = [func for func in self.m_lVisible if func.IsAlive()]
+        if not self.m_lVisible:
+            return True
+        return any(func() for func in self.m_lVisible)
+
+    def _Check(self):
+        # 键盘由全局钩子记录时间, 鼠标按位置变化判断
+        fNow = time.time()
+        pos = QCursor.pos()
+        if pos != self.m_CursorPos:
+            self.m_CursorPos = pos
+            self.m_fLastInput = fNow
+        self.m_fLastInput = max(self.m_fLastInput, core_input.GetLastInputTime())
+        iIdleSec = core_setting.Get(SettingName.IdleSuspendSec)
+        bIdle = iIdleSec > 0 and fNow - self.m_fLastInput > iIdleSec
+        bSuspend = bIdle or not self._IsVisible()
+        if bSuspend == self.m_bSuspend:
+            return
+        self.m_bSuspend = bSuspend
+        core_event.TriggerEvent("ANIMATION_SUSPEND", bSuspend)
+
+
+if "g_Instance" not in globals():
+    g_Instance = IdleMgr()
+
+
+def Initialize():
+    g_Instance.Start()
+
+
+# ------------------- api --------------------
+AddVisibleCheck = g_Instance.AddVisibleCheck
+IsSuspend = g_Instance.IsSuspend
@@ -3,16 +3,24 @@
 # Crete Data：2024/6/3
 # Desc：不过是大梦一场空，不过是孤影照惊鸿。
 import threading
+import time
 import keyboard
 
 
-from core import core_timer, core_save
-from core.core_define import Path_Setting, SettingName
+from core import core_timer, core_setting
+from core.core_define import SettingName
 from core.functor import CFunctor
 
 if "g_HotKeyTimeOut" not in globals():
-	data = core_save.LoadJson(Path_Setting)
-	g_HotKeyTimeOut = data.get(SettingName.TimerResetTime, 2000)
+	g_HotKeyTimeOut = core_setting.Get(SettingName.TimerResetTime)
+
+
+def _OnHotKeyTimeOutChange(iTime):
+	global g_HotKeyTimeOut
+	g_HotKeyTimeOut = iTime
+
+
+core_setting.BindSetting(SettingName.TimerResetTime, _OnHotKeyTimeOutChange)
 
 
 class KeyType:
@@ -89,6 +97,10 @@ class Input:
 		self.m_lHold = []  # 本轮按键按住列表
 		self.m_lRelease = []  # 本轮按键释放列表
 		self.m_oLock = threading.Lock()  # 线程锁
+		self.m_dKeyIndex = {}  # 按键 -> 需要检测该按键的监听器
+		self.m_lAnyKey = []  # 需要检测所有按键的监听器(强制匹配、监听所有按键)
+		self.m_bIndexDirty = False  # 监听器有增删, 下一帧重建索引
+		self.m_fLastInputTime = 0  # 最后一次按键的时间, 空闲检测使用
 
 	def StartListen(self):
 		listener_thread = threading.Thread(target=self._keyboard_listener, daemon=True)
@@ -109,6 +121,7 @@ class Input:
 			self._on_release(sKey)
 
 	def _on_press(self, sKey):
+		self.m_fLastInputTime = time.time()
 		self.m_oLock.acquire()
 		if sKey not in self.m_lHold:
 			# print("按键按下：", sKey, time.time()*1000)
@@ -128,38 +141,61 @@ class Input:
 		skey = skey.lower()
 		return skey in self.m_lHold
 
+	def GetLastInputTime(self):
+		return self.m_fLastInputTime
+
 	def Update(self):
 		self.m_oLock.acquire()
 		try:
-			if self.m_AddCache:
-				for oListen in self.m_AddCache:
-					self.m_dListen[oListen.m_Uid] = oListen
-				self.m_AddCache.clear()
+			self._ApplyCache()
 			for sKey in self.m_lPress:
-				for uid, oListen in self.m_dListen.items():
-					if uid in self.m_DelCache:
-						continue
-					oListen.TryActive(sKey, KeyType.Press)
+				self._Dispatch(sKey, KeyType.Press)
 			for sKey in self.m_lRelease:
-				for uid, oListen in self.m_dListen.items():
-					if uid in self.m_DelCache:
-						continue
-					oListen.TryActive(sKey, KeyType.Release)
+				self._Dispatch(sKey, KeyType.Release)
 			for sKey in self.m_lHold:
-				for uid, oListen in self.m_dListen.items():
-					if uid in self.m_DelCache:
-						continue
-					oListen.TryActive(sKey, KeyType.Hold)
-
-			for uid in self.m_DelCache:
-				if uid in self.m_dListen:
-					del self.m_dListen[uid]
+				self._Dispatch(sKey, KeyType.Hold)
 		finally:
-			self.m_DelCache.clear()
 			self.m_lPress.clear()
 			self.m_lRelease.clear()
 			self.m_oLock.release()
 
+	def _ApplyCache(self):
+		# 上一帧以来的增删一起生效, 索引只重建一次
+		if self.m_DelCache:
+			for uid in self.m_DelCache:
+				self.m_dListen.pop(uid, None)
+			self.m_DelCache.clear()
+			self.m_bIndexDirty = True
+		if self.m_AddCache:
+			for oListen in self.m_AddCache:
+				self.m_dListen[oListen.m_Uid] = oListen
+			self.m_AddCache.clear()
+			self.m_bIndexDirty = True
+		if self.m_bIndexDirty:
+			self._RebuildIndex()
+
+	def _RebuildIndex(self):
+		# 普通热键只会响应自己组合里的按键, 其他按键直接跳过; 列表按注册顺序排列
+		self.m_bIndexDirty = False
+		self.m_lAnyKey = []
+		self.m_dKeyIndex = {}
+		for uid, oListen in sorted(self.m_dListen.items()):
+			if oListen.m_bAllKeys or oListen.m_ForceMatch:
+				self.m_lAnyKey.append(oListen)
+				for lListen in self.m_dKeyIndex.values():
+					lListen.append(oListen)
+				continue
+			for sKey in set(oListen.m_OriKeys):
+				if sKey not in self.m_dKeyIndex:
+					self.m_dKeyIndex[sKey] = list(self.m_lAnyKey)
+				self.m_dKeyIndex[sKey].append(oListen)
+
+	def _Dispatch(self, sKey, key_type):
+		for oListen in self.m_dKeyIndex.get(sKey, self.m_lAnyKey):
+			if oListen.m_Uid in self.m_DelCache:
+				continue
+			oListen.TryActive(sKey, key_type)
+
 	def RegisterHotKey(self, keys, func, key_type=KeyType.Press, force_match=False):
 		if not func or not keys:
 			return
@@ -182,12 +218,15 @@ class Input:
 		uid = self.m_uid
 		oListen = Listerner(uid, [], func)
 		oListen.m_bAllKeys = True
-		self.m_dListen[uid] = oListen
+		self.m_AddCache.append(oListen)
 		return Listerner_Ref(uid)
 
 	def RemoveHotKey(self, uid):
 		if uid in self.m_dListen:
 			self.m_DelCache.append(uid)
+		elif self.m_AddCache:
+			# 同一帧内注册又删除的, 还没有生效
+			self.m_AddCache = [oListen for oListen in self.m_AddCache if oListen.m_Uid != uid]
 
 
 if "g_Instance" not in globals():
@@ -199,3 +238,4 @@ Update = g_Instance.Update
 RegisterHotKey = g_Instance.RegisterHotKey
 RegisterInputCb = g_Instance.RegisterInputCb
 IsKeyHold = g_Instance.IsKeyHold
+GetLastInputTime = g_Instance.GetLastInputTime
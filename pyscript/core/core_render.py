@@ -0,0 +1,65 @@
+# --*utf-8*--
+# Author：一念断星河
+# Crete Data：2026/10/19
+# Desc：不过是大梦一场空，不过是孤影照惊鸿。
+# 渲染节拍: 与逻辑更新分开, 需要重绘的窗口先记下来, 按屏幕刷新率统一重绘
+# 没有需要重绘的窗口时渲染定时器自动停止
+from PySide6.QtCore import QTimer, Qt
+from PySide6.QtGui import QGuiApplication
+
+from core import core_setting
+from core.core_define import SettingName
+from .functor import CFunctor
+
+
+class RenderMgr:
+    def __init__(self):
+        self.m_dDirty = {}  # key -> 重绘函数, 同一帧内多次标记只重绘一次
+        self.m_Timer = None
+        self.m_iIntervalMs = 16
+
+    def _MakeSureTimer(self):
+        if self.m_Timer:
+            return
+        self.m_Timer = QTimer()
+        self.m_Timer.setTimerType(Qt.PreciseTimer)
+        self.m_Timer.timeout.connect(self._Flush)
+        self.UpdateInterval()
+
+    def UpdateInterval(self, *args):
+        # 渲染帧率不超过屏幕刷新率
+        iFps = core_setting.Get(SettingName.RenderFps)
+        screen = QGuiApplication.primaryScreen()
+        if screen and screen.refreshRate() > 0:
+            iFps = min(iFps, screen.refreshRate())
+        self.m_iIntervalMs = max(1, int(1000 / max(1, iFps)))
+        if self.m_Timer:
+            self.m_Timer.setInterval(self.m_iIntervalMs)
+
+    def MarkDirty(self, key, func):
+        if key not in self.m_dDirty:
+            self.m_dDirty[key] = CFunctor(func)
+        self._MakeSureTimer()
+        if not self.m_Timer.isActive():
+            self.m_Timer.start(self.m_iIntervalMs)
+
+    def _Flush(self):
+        dDirty, self.m_dDirty = self.m_dDirty, {}
+        for func in dDirty.values():
+            if func.IsAlive():
+                func()
+        if not self.m_dDirty:
+            # 没有变化, 停止渲染节拍, 下一次标记时再启动
+            self.m_Timer.stop()
+
+
+if "g_Instance" not in globals():
+    g_Instance = RenderMgr()
+
+
+def Initialize():
+    core_setting.BindSetting(SettingName.RenderFps, g_Instance.UpdateInterval)
+
+
+# ------------------- api --------------------
+MarkDirty = g_Instance.MarkDirty
@@ -3,8 +3,84 @@
 # Crete Data：2024/6/15
 # Desc：不过是大梦一场空，不过是孤影照惊鸿。
 
+import contextlib
+import copy
 import json
 import os
+import time
+
+from core import core_db, core_event
+from core.core_define import JournalPaths, StorageBackend, Path_DB, ProfilePaths, Path_ProfileRoot
+
+JournalSuffix = ".journal"  # 日志文件后缀, 与配置文件放在一起
+JournalMaxSize = 64 * 1024  # 日志超过该大小(字节)时合并进快照
+JournalMaxTime = 60 * 1000  # 距离上次合并超过该时间(毫秒)时合并进快照
+
+if "g_CompactTime" not in globals():
+	g_CompactTime = {}  # 配置路径 -> 上次合并时间
+
+if "g_WriteStamp" not in globals():
+	g_WriteStamp = {}  # 配置路径 -> 本程序最后一次写入后的文件状态, 用于区分外部修改
+
+if "g_DB" not in globals():
+	g_DB = None  # sqlite 后端
+
+if "g_Profile" not in globals():
+	g_Profile = ""  # 当前配置方案, 空字符串为默认方案(resources/config 下的配置)
+
+if "g_Batch" not in globals():
+	g_Batch = None  # 批量修改中缓存的改动: 配置路径 -> 改动记录列表
+
+
+def _GetDB(path, profile=None):
+	# sqlite 后端的数据库, json 后端返回None; 首次访问某个配置时从json导入
+	global g_DB
+	if StorageBackend != "sqlite":
+		return None
+	if g_DB is None:
+		g_DB = core_db.ProfileDB(Path_DB)
+	sReal = ResolvePath(path, profile)
+	if not g_DB.IsImported(sReal):
+		g_DB.ImportDoc(sReal, _LoadJsonFile(path, profile))
+	return g_DB
+
+
+# ------------------- 配置方案 --------------------
+def ResolvePath(path, profile=None):
+	"""
+	配置的实际路径, 定时器和分组配置按方案分别保存在 Path_ProfileRoot/方案名/ 下
+	:param profile: 方案名, None 为当前方案
+	"""
+	if profile is None:
+		profile = g_Profile
+	if not profile or path not in ProfilePaths:
+		return path
+	return os.path.join(Path_ProfileRoot, profile, os.path.basename(path))
+
+
+def GetProfile():
+	return g_Profile
+
+
+def SetProfile(profile):
+	global g_Profile
+	g_Profile = profile
+
+
+def GetProfiles():
+	# 所有配置方案, 默认方案排在最前
+	lProfile = [""]
+	if os.path.isdir(Path_ProfileRoot):
+		for sName in sorted(os.listdir(Path_ProfileRoot)):
+			if os.path.isdir(os.path.join(Path_ProfileRoot, sName)):
+				lProfile.append(sName)
+	return lProfile
+
+
+def CreateProfile(profile):
+	sDir = os.path.join(Path_ProfileRoot, profile)
+	if not os.path.exists(sDir):
+		os.makedirs(sDir)
 
 
 def MakeSureDirExist(path):
@@ -18,20 +94,317 @@ def MakeSureDirExist(path):
 			json.dump({}, f, ensure_ascii=False, indent=4)
 
 
-def LoadJson(path):
-	# 读取json文件
+def IsJournal(path):
+	# 该配置是否开启日志模式
+	return path in JournalPaths
+
+
+def LoadJson(path, profile=None):
+	# 读取配置, profile 为 None 时读取当前方案
+	db = _GetDB(path, profile)
+	if db:
+		return db.LoadDoc(ResolvePath(path, profile))
+	return _LoadJsonFile(path, profile)
+
+
+def LoadItem(path, key):
+	# 读取配置中的某一项
+	db = _GetDB(path)
+	if db:
+		return db.LoadItem(ResolvePath(path), key)
+	return LoadJson(path).get(str(key), None)
+
+
+def LoadLazy(path):
+	"""
+	读取配置, 关闭的配置项只读取摘要(sName/groupId/bOpen), 需要时再用 LoadItem 读取完整数据
+	json 后端整个文件都要解析, 全部返回完整数据
+	:return: (完整数据, 摘要数据)
+	"""
+	db = _GetDB(path)
+	if db:
+		return db.LoadLazy(ResolvePath(path))
+	return LoadJson(path), {}
+
+
+def LoadSnapshot(path, profile=None):
+	"""
+	只读取快照, 不重放日志也不记录文件状态, 可以在后台线程调用; 结果在主线程交给 AcceptSnapshot
+	:return: (快照数据, 读取前的文件状态), 读取失败或 sqlite 后端还未导入时数据为None
+	"""
+	sReal = ResolvePath(path, profile)
+	if StorageBackend == "sqlite":
+		if g_DB is None or not g_DB.IsImported(sReal):
+			return None, None
+		return g_DB.LoadDoc(sReal), FileStamp(path, profile)
+	return _ReadSnapshot(sReal)
+
+
+def AcceptSnapshot(path, data, stamp, profile=None):
+	# 记录后台读取的快照的文件状态并重放日志, 必须在主线程调用
+	if StorageBackend == "sqlite":
+		return data
+	return _AcceptSnapshot(path, data, stamp, profile)
+
+
+def FileStamp(path, profile=None):
+	# 配置文件当前的状态, 与读取时的状态不同说明之后被修改过
+	return _FileStamp(ResolvePath(path, profile))
+
+
+def _ReadSnapshot(sReal):
+	# 先取文件状态再读取, 读取期间文件被修改时状态是旧的, 之后会被当作外部修改重新读取
+	stamp = _FileStamp(sReal)
 	try:
-		MakeSureDirExist(path)
-		with open(path, "r", encoding="utf-8") as f:
-			data = json.load(f)
+		with open(sReal, "r", encoding="utf-8") as f:
+			return json.load(f), stamp
 	except:
-		print("读取文件:", path, "失败")
+		return None, stamp
+
+
+def _LoadJsonFile(path, profile=None):
+	# 读取json文件, 日志模式下会在快照上重放日志
+	sReal = ResolvePath(path, profile)
+	MakeSureDirExist(sReal)
+	data, stamp = _ReadSnapshot(sReal)
+	return _AcceptSnapshot(path, data, stamp, profile)
+
+
+def _AcceptSnapshot(path, data, stamp, profile=None):
+	sReal = ResolvePath(path, profile)
+	bExternal = False
+	if data is None:
+		print("读取文件:", sReal, "失败")
 		data = {}
+	else:
+		# 快照在读过之后被外部替换(手动编辑、同步), 本地日志是基于旧快照的改动
+		bExternal = sReal in g_WriteStamp and g_WriteStamp[sReal] != stamp
+		# 已读取的文件状态, 之后文件再次变化才算外部修改
+		g_WriteStamp[sReal] = stamp
+	if IsJournal(path):
+		if bExternal:
+			# 重放会把外部删除的条目加回来, 或用旧的本地字段覆盖同步过来的值, 以外部修改为准
+			_DropJournal(sReal)
+		else:
+			_ReplayJournal(sReal, data)
 	return data
 
 
+def _NotifySave(path):
+	# 当前方案的存档被修改, 预加载的旧数据需要作废
+	if path in ProfilePaths:
+		core_event.TriggerEvent("PROFILE_SAVE", g_Profile)
+
+
 def SaveJson(path, data):
-	# 保存json文件
-	MakeSureDirExist(path)
-	with open(path, "w", encoding="utf-8") as f:
+	# 保存json文件(完整快照), 先写临时文件再替换, 避免写到一半崩溃损坏存档
+	_NotifySave(path)
+	db = _GetDB(path)
+	sReal = ResolvePath(path)
+	if db:
+		db.SaveDoc(sReal, data)
+		return
+	MakeSureDirExist(sReal)
+	tmp_path = sReal + ".tmp"
+	with open(tmp_path, "w", encoding="utf-8") as f:
 		json.dump(data, f, ensure_ascii=False, indent=4)
+	os.replace(tmp_path, sReal)
+	g_WriteStamp[sReal] = _FileStamp(sReal)
+	if IsJournal(path):
+		# 快照已包含所有改动, 日志可以清空
+		sJournal = sReal + JournalSuffix
+		if os.path.exists(sJournal):
+			os.remove(sJournal)
+		g_CompactTime[sReal] = time.time() * 1000
+
+
+def SaveField(path, key, fields):
+	"""
+	修改配置中某一项的部分字段
+	:param path: 配置路径
+	:param key: 配置项key, 如定时器uid
+	:param fields: 改动的字段 {字段名: 值}
+	"""
+	if not fields:
+		return
+	_NotifySave(path)
+	key = str(key)
+	if g_Batch is not None:
+		g_Batch.setdefault(path, []).append({"k": key, "f": copy.deepcopy(fields)})
+		return
+	db = _GetDB(path)
+	if db:
+		db.SaveField(ResolvePath(path), key, fields)
+		return
+	if not IsJournal(path):
+		data = LoadJson(path)
+		info = data.get(key, {})
+		info.update(fields)
+		data[key] = info
+		SaveJson(path, data)
+		return
+	_AppendJournal(path, [{"k": key, "f": fields}])
+
+
+def SaveValue(path, key, value):
+	# 修改配置中某一项的值(整体替换)
+	_NotifySave(path)
+	key = str(key)
+	if g_Batch is not None:
+		g_Batch.setdefault(path, []).append({"k": key, "v": copy.deepcopy(value)})
+		return
+	db = _GetDB(path)
+	if db:
+		db.SaveValue(ResolvePath(path), key, value)
+		return
+	if not IsJournal(path):
+		data = LoadJson(path)
+		data[key] = value
+		SaveJson(path, data)
+		return
+	_AppendJournal(path, [{"k": key, "v": value}])
+
+
+def DeleteKey(path, key):
+	# 删除配置中的某一项
+	_NotifySave(path)
+	key = str(key)
+	if g_Batch is not None:
+		g_Batch.setdefault(path, []).append({"k": key, "d": 1})
+		return
+	db = _GetDB(path)
+	if db:
+		db.DeleteKey(ResolvePath(path), key)
+		return
+	if not IsJournal(path):
+		data = LoadJson(path)
+		if key not in data:
+			return
+		del data[key]
+		SaveJson(path, data)
+		return
+	_AppendJournal(path, [{"k": key, "d": 1}])
+
+
+@contextlib.contextmanager
+def Batch():
+	"""
+	批量修改: 期间的 SaveField/SaveValue/DeleteKey 先缓存, 结束时每个配置只写一次
+	期间读取到的还是修改前的数据; 嵌套时由最外层统一写入
+	"""
+	global g_Batch
+	if g_Batch is not None:
+		yield
+		return
+	g_Batch = {}
+	try:
+		yield
+	finally:
+		dBatch, g_Batch = g_Batch, None
+		for path, lRecord in dBatch.items():
+			_FlushBatch(path, lRecord)
+
+
+def _FlushBatch(path, lRecord):
+	db = _GetDB(path)
+	if db:
+		sReal = ResolvePath(path)
+		data, lKey = {}, []
+		for record in lRecord:
+			key = record["k"]
+			if key not in lKey:
+				lKey.append(key)
+				item = db.LoadItem(sReal, key)
+				if item is not None:
+					data[key] = item
+			_ApplyRecord(data, record)
+		db.SaveItems(sReal, data, [key for key in lKey if key not in data])
+		return
+	if not IsJournal(path):
+		data = LoadJson(path)
+		for record in lRecord:
+			_ApplyRecord(data, record)
+		SaveJson(path, data)
+		return
+	_AppendJournal(path, lRecord)
+
+
+def _ApplyRecord(data, record):
+	# 把一条改动记录应用到配置数据上
+	key = record["k"]
+	if "d" in record:
+		data.pop(key, None)
+	elif "v" in record:
+		data[key] = record["v"]
+	else:
+		info = data.get(key, None) or {}
+		info.update(record["f"])
+		data[key] = info
+
+
+def Compact(path):
+	# 把日志合并进快照
+	if _GetDB(path):
+		return
+	if IsExternalChange(path):
+		# 外部修改还没有被重新加载, 合并会用本地数据覆盖它; 日志在重新加载时丢弃
+		return
+	SaveJson(path, LoadJson(path))
+
+
+def UseFile(path):
+	# 配置是否直接保存在文件中(json后端), 文件监听只对这些配置生效
+	return _GetDB(path) is None
+
+
+def IsExternalChange(path):
+	# 文件最近一次修改是否来自本程序以外(手动编辑、同步等)
+	sReal = ResolvePath(path)
+	return _FileStamp(sReal) != g_WriteStamp.get(sReal, None)
+
+
+def _FileStamp(path):
+	try:
+		stat = os.stat(path)
+	except OSError:
+		return None
+	return stat.st_mtime_ns, stat.st_size
+
+
+# ------------------- 日志 --------------------
+def _AppendJournal(path, lRecord):
+	sReal = ResolvePath(path)
+	MakeSureDirExist(sReal)
+	if sReal not in g_CompactTime:
+		g_CompactTime[sReal] = time.time() * 1000
+	sLine = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in lRecord)
+	with open(sReal + JournalSuffix, "a", encoding="utf-8") as f:
+		f.write(sLine)
+		f.flush()
+		os.fsync(f.fileno())
+		iSize = f.tell()
+	if iSize >= JournalMaxSize or time.time() * 1000 - g_CompactTime[sReal] >= JournalMaxTime:
+		Compact(path)
+
+
+def _DropJournal(path):
+	sJournal = path + JournalSuffix
+	if os.path.exists(sJournal):
+		print("配置文件被外部修改, 丢弃本地日志:", sJournal)
+		os.remove(sJournal)
+	g_CompactTime.pop(path, None)
+
+
+def _ReplayJournal(path, data):
+	sJournal = path + JournalSuffix
+	if not os.path.exists(sJournal):
+		return
+	with open(sJournal, "r", encoding="utf-8") as f:
+		for sLine in f:
+			try:
+				record = json.loads(sLine)
+			except ValueError:
+				# 最后一条记录可能写到一半就崩溃了, 直接丢弃
+				print("日志记录损坏, 已忽略:", sJournal)
+				break
+			_ApplyRecord(data, record)
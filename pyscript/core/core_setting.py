@@ -0,0 +1,94 @@
+# --*utf-8*--
+# Author：一念断星河
+# Crete Data：2026/10/19
+# Desc：不过是大梦一场空，不过是孤影照惊鸿。
+# 全局设置: setting.json 只读取一次, 修改时写回存档并按设置项触发事件
+import copy
+
+from core import core_save, core_event
+from core.core_define import Path_Setting, SettingName
+
+# 设置项 -> (类型, 默认值)
+SettingTypes = {
+	SettingName.DefaultPetRes: (str, ""),
+	SettingName.PetIconSize: (int, 72),
+	SettingName.PetIconPos: (list, None),
+	SettingName.PetIconUpdateTime: (int, 100),
+	SettingName.TimerReset: (list, ["F2"]),
+	SettingName.TimerResetTime: (int, 2000),
+	SettingName.AEJumpSwitch: (bool, False),
+	SettingName.AEJumpTime1: (int, 0),
+	SettingName.AEJumpTime2: (int, 0),
+	SettingName.AEJumpTime3: (int, 0),
+	SettingName.AEJumpKey: (list, []),
+	SettingName.Profile: (str, ""),
+	SettingName.RecentProfiles: (list, []),
+	SettingName.OverlayMode: (bool, False),
+	SettingName.SweepFps: (int, 30),
+	SettingName.EngineTickMs: (int, 10),
+	SettingName.RenderFps: (int, 60),
+	SettingName.IdleSuspendSec: (int, 300),
+}
+
+
+def EventName(key):
+	# 设置项修改事件, 回调参数为新的值
+	return f"SETTING_CHANGED_{key}"
+
+
+class SettingMgr:
+	def __init__(self):
+		self.m_Data = None
+
+	def _Load(self):
+		data = core_save.LoadJson(Path_Setting)
+		self.m_Data = {}
+		for key, (valueType, default) in SettingTypes.items():
+			value = data.get(key, None)
+			if value is None:
+				value = copy.deepcopy(default)
+			elif not isinstance(value, valueType):
+				try:
+					value = valueType(value)
+				except (TypeError, ValueError):
+					print("设置项类型错误, 使用默认值:", key, value)
+					value = copy.deepcopy(default)
+			self.m_Data[key] = value
+
+	def Get(self, key):
+		if self.m_Data is None:
+			self._Load()
+		return self.m_Data[key]
+
+	def Set(self, key, value):
+		if self.m_Data is None:
+			self._Load()
+		if self.m_Data[key] == value:
+			return
+		self.m_Data[key] = copy.deepcopy(value)
+		core_save.SaveValue(Path_Setting, key, value)
+		core_event.TriggerEvent(EventName(key), value)
+
+	def __getattr__(self, name):
+		# 以设置项名字作为属性访问, 如 g_Instance.pet_icon_size
+		if name in SettingTypes:
+			return self.Get(name)
+		raise AttributeError(name)
+
+
+if "g_Instance" not in globals():
+	g_Instance = SettingMgr()
+
+
+def Initialize():
+	pass
+
+
+def BindSetting(key, func, bindObj=None):
+	"""监听设置项修改, func(value)"""
+	return core_event.BindEvent(EventName(key), func, bindObj)
+
+
+# ------------------- api --------------------
+Get = g_Instance.Get
+Set = g_Instance.Set
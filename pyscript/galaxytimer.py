@@ -16,6 +16,7 @@ def Loop():
         g_TimeMs = curTimeMs
         core_input.Update()
         core_timer.UpdateTimer(deltaMs)
+        core_cooldown.UpdateCooldown(deltaMs)
     except KeyboardInterrupt:
         global updateTimer, main_window
         if updateTimer:
@@ -36,13 +37,19 @@ if __name__ == '__main__':
     # 初始化输入、定时器、语音
     from core import core_input
     from core import core_timer
+    from core import core_cooldown
     from core import core_voice
     from core import core_event
+    from core import core_setting
+    from core import core_render
+    from core import core_idle
+    from core.core_define import SettingName
     # 加载资源
     from widgets._rc import resource  # noqa
 
     core_input.Initialize()
     core_timer.Initialize()
+    core_cooldown.Initialize()
     core_voice.Initialize()
     core_event.Initialize()
 
@@ -59,9 +66,13 @@ if __name__ == '__main__':
     # 时间戳
     g_TimeMs = time.time() * 1000
 
-    # 定时器
+    # 逻辑定时器: 热键和倒计时, 与渲染帧率分开; 重绘由 core_render 按屏幕刷新率统一处理
     updateTimer = QTimer(app)
+    updateTimer.setTimerType(Qt.PreciseTimer)
     updateTimer.timeout.connect(Loop)
-    updateTimer.start(16)  # 控制在60帧
+    updateTimer.start(core_setting.Get(SettingName.EngineTickMs))
+    core_setting.BindSetting(SettingName.EngineTickMs, updateTimer.setInterval)
+    core_render.Initialize()
+    core_idle.Initialize()
 
     app.exec()
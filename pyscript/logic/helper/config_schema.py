@@ -0,0 +1,244 @@
+# --*utf-8*--
+# Author：一念断星河
+# Crete Data：2026/10/19
+# Desc：不过是大梦一场空，不过是孤影照惊鸿。
+# 存档结构版本与迁移: 启动时只迁移一次, 之后加载时不再写盘
+# 版本号存在存档里, 存档被替换成旧格式(从其他电脑复制)时版本号跟着变旧, 只有这时加载才需要校验
+import copy
+
+from core import core_save
+from core.core_define import Path_Timer, Path_Group
+from widgets.common.config import ConfigValidator, RangeValidator, BoolValidator, ColorValidator
+
+
+class IntValidator(RangeValidator):
+    """ 整数, 超出范围时截断, 不是数字时使用默认值 """
+
+    def __init__(self, min, max, default):
+        super().__init__(min, max)
+        self.iDefault = default
+
+    def validate(self, value):
+        return type(value) is int and super().validate(value)
+
+    def correct(self, value):
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            return self.iDefault
+        return super().correct(value)
+
+
+class StrValidator(ConfigValidator):
+    """ 字符串 """
+
+    def validate(self, value):
+        return isinstance(value, str)
+
+    def correct(self, value):
+        return "" if value is None else str(value)
+
+
+class HexColorValidator(ColorValidator):
+    """ 以 #RRGGBB / #AARRGGBB 字符串保存的颜色 """
+
+    def __init__(self, default):
+        super().__init__(default)
+        self.sDefault = default
+
+    def validate(self, color):
+        return isinstance(color, str) and super().validate(color)
+
+    def correct(self, value):
+        return value if self.validate(value) else self.sDefault
+
+
+class KeyCodeValidator(ConfigValidator):
+    """ 热键列表 [[key, key], [key]] """
+
+    def validate(self, value):
+        if not isinstance(value, list) or not value:
+            return False
+        return all(isinstance(keys, list) and all(isinstance(k, str) for k in keys) for keys in value)
+
+    def correct(self, value):
+        if not value or not isinstance(value, list):
+            return [[]]
+        # 老存档只有一组热键 [key, key]
+        if isinstance(value[0], str):
+            value = [value]
+        return [[str(k) for k in keys] for keys in value if isinstance(keys, list)] or [[]]
+
+
+class PosValidator(ConfigValidator):
+    """ 坐标 [x, y] """
+
+    def validate(self, value):
+        return isinstance(value, list) and len(value) == 2 and all(type(v) is int for v in value)
+
+    def correct(self, value):
+        try:
+            return [int(value[0]), int(value[1])]
+        except (TypeError, ValueError, IndexError):
+            return [0, 0]
+
+
+# 存档字段: (字段名, 默认值, 校验器)
+TimerSchema = (
+    ("sName", "新建定时器", StrValidator()),
+    ("sCDText", "冷却中", StrValidator()),
+    ("sPic", "", StrValidator()),
+    ("sMaskPic", "", StrValidator()),
+    ("sReadyText", "已就绪", StrValidator()),
+    ("iTime", 3, IntValidator(0, 24 * 3600, 3)),
+    ("lKeyCode", [[]], KeyCodeValidator()),
+    ("bOpen", False, BoolValidator()),  # 是否开启
+    ("bReset", False, BoolValidator()),  # 允许被重置
+    ("bTriggerInCd", True, BoolValidator()),  # 允许冷却时触发
+    ("bCycle", False, BoolValidator()),  # 循环触发
+    ("bVoice", True, BoolValidator()),  # 语音播报
+    ("bIconTimer", True, BoolValidator()),  # 文本|图标定时器
+    ("iFontSize", 18, IntValidator(1, 500, 18)),
+    ("iBoardSize", 0, IntValidator(0, 500, 0)),
+    ("iConSize", 50, IntValidator(0, 2000, 50)),
+    ("cdColor", "#FF0000", HexColorValidator("#FF0000")),
+    ("readyColor", "#00FFFF", HexColorValidator("#00FFFF")),
+    ("bgColor", "#00000000", HexColorValidator("#00000000")),
+    ("boardColor", "#000000", HexColorValidator("#000000")),
+    ("groupId", 0, IntValidator(-2 ** 31, 2 ** 31 - 1, 0)),
+    ("force_match", False, BoolValidator()),
+    ("tPos", [0, 0], PosValidator()),
+    ("bTenths", False, BoolValidator()),  # 最后几秒显示十分之一秒
+    ("iTenthsBelow", 5, IntValidator(1, 3600, 5)),  # 剩余多少秒以内显示十分之一秒
+)
+
+GroupSchema = (
+    ("sName", "新建分组", StrValidator()),
+    ("bOpen", False, BoolValidator()),
+)
+
+# 需要迁移的配置 -> 每一项的字段
+Schemas = {
+    Path_Timer: TimerSchema,
+    Path_Group: GroupSchema,
+}
+
+# 懒加载时只读取的摘要字段
+SummaryKeys = ("sName", "groupId", "bOpen")
+
+# 当前存档版本, 修改存档结构时 +1 并在 Migrations 中加入对应的迁移函数
+SchemaVersion = 2
+VersionKey = "_version"  # 存档中记录版本的项, 不是配置项
+
+
+def _MigrateV1(path, doc):
+    # 1: 补全缺省字段, 热键统一为多组热键格式(由校验器完成)
+    return doc
+
+
+def _MigrateV2(path, doc):
+    # 2: 定时器新增 bTenths/iTenthsBelow, 默认值由校验器补全
+    return doc
+
+
+# 版本号 -> 迁移函数, 从存档版本依次执行到 SchemaVersion
+Migrations = {
+    1: _MigrateV1,
+    2: _MigrateV2,
+}
+
+
+def ValidateItem(path, item):
+    """
+    补全缺省字段并修正非法值
+    :return: 修正后的配置项
+    """
+    result = dict(item) if isinstance(item, dict) else {}
+    for sKey, default, validator in Schemas[path]:
+        if sKey not in result:
+            result[sKey] = copy.deepcopy(default)
+        elif not validator.validate(result[sKey]):
+            result[sKey] = validator.correct(result[sKey])
+    return result
+
+
+def ValidateDoc(path, doc):
+    # 校验整个配置, 非数字的key丢弃
+    result = {}
+    for key, item in doc.items():
+        try:
+            int(key)
+        except ValueError:
+            print("存档中的非法项, 已丢弃:", path, key)
+            continue
+        result[str(key)] = ValidateItem(path, item)
+    return result
+
+
+def ValidateSummary(path, doc):
+    # 校验懒加载的摘要, 只保留摘要字段
+    return {key: {sKey: item[sKey] for sKey in SummaryKeys if sKey in item}
+            for key, item in ValidateDoc(path, doc).items()}
+
+
+def IsCurrent(iVersion):
+    return iVersion == SchemaVersion
+
+
+def CheckDoc(path, doc):
+    # 取出版本号, 版本不是最新时校验
+    if IsCurrent(doc.pop(VersionKey, None)):
+        return doc
+    return ValidateDoc(path, doc)
+
+
+def LoadDoc(path, profile=None):
+    # 读取配置, 版本不是最新时校验
+    return CheckDoc(path, core_save.LoadJson(path, profile))
+
+
+def LoadLazy(path):
+    """
+    读取配置, 关闭的配置项只有摘要; 版本不是最新时校验
+    :return: (完整数据, 摘要数据)
+    """
+    data, lazy_data = core_save.LoadLazy(path)
+    iVersion = data.pop(VersionKey, None)
+    if iVersion is None:
+        # sqlite 后端的懒加载不含版本项
+        iVersion = lazy_data.pop(VersionKey, None) or core_save.LoadItem(path, VersionKey)
+    if IsCurrent(iVersion):
+        return data, lazy_data
+    return ValidateDoc(path, data), ValidateSummary(path, lazy_data)
+
+
+def LoadItem(path, key):
+    # 读取某一项, 不存在时返回默认数据; 版本不是最新时校验
+    item = core_save.LoadItem(path, key)
+    if item is not None and IsCurrent(core_save.LoadItem(path, VersionKey)):
+        return item
+    return ValidateItem(path, item)
+
+
+def NewItem(path, **kwargs):
+    # 新建配置项的完整数据
+    return ValidateItem(path, kwargs)
+
+
+def Migrate():
+    """
+    存档迁移, 启动和切换配置方案时调用
+    每个配置的版本记在自己的存档里, 版本已是最新的配置直接跳过, 不写盘
+    """
+    for path in Schemas:
+        iVersion = core_save.LoadItem(path, VersionKey) or 0
+        if iVersion >= SchemaVersion:
+            continue
+        print("存档迁移:", core_save.ResolvePath(path), iVersion, "->", SchemaVersion)
+        doc = core_save.LoadJson(path)
+        doc.pop(VersionKey, None)
+        for iNext in range(iVersion + 1, SchemaVersion + 1):
+            doc = Migrations[iNext](path, doc)
+        doc = ValidateDoc(path, doc)
+        doc[VersionKey] = SchemaVersion
+        core_save.SaveJson(path, doc)
@@ -0,0 +1,62 @@
+# --*utf-8*--
+# Author：一念断星河
+# Crete Data：2026/10/19
+# Desc：不过是大梦一场空，不过是孤影照惊鸿。
+import os
+
+from PySide6.QtCore import QObject, QFileSystemWatcher, QTimer
+
+from core import core_save
+from core.functor import CFunctor
+
+
+class ConfigWatcher(QObject):
+    """ 监听配置文件的外部修改(手动编辑、其他电脑同步), 本程序自己的写入会被忽略 """
+
+    def __init__(self, paths, func, parent=None):
+        super().__init__(parent)
+        self.m_Func = CFunctor(func)
+        self.m_Paths = {}  # 实际文件路径 -> 配置路径
+        self.m_Pending = set()  # 收到通知时已确认是外部修改的文件
+        self.m_Watcher = QFileSystemWatcher(self)
+        self.m_Watcher.fileChanged.connect(self._on_file_changed)
+
+        # 编辑器保存时可能连续写好几次, 合并后再处理
+        self.m_DelayTimer = QTimer(self)
+        self.m_DelayTimer.setSingleShot(True)
+        self.m_DelayTimer.setInterval(300)
+        self.m_DelayTimer.timeout.connect(self._on_delay_timeout)
+
+        self.SetPaths(paths)
+
+    def SetPaths(self, paths):
+        files = self.m_Watcher.files()
+        if files:
+            self.m_Watcher.removePaths(files)
+        self.m_Pending.clear()
+        # sqlite 后端的配置不在文件里, 不需要监听; 切换配置方案后需要重新设置
+        self.m_Paths = {core_save.ResolvePath(path): path for path in paths if core_save.UseFile(path)}
+        files = [path for path in self.m_Paths if os.path.exists(path)]
+        if files:
+            self.m_Watcher.addPaths(files)
+
+    def _on_file_changed(self, path):
+        # 收到通知时就判断是否外部修改, 等待期间本程序的写入(合并日志)会更新文件状态
+        sConfig = self.m_Paths.get(path, None)
+        if sConfig is not None and core_save.IsExternalChange(sConfig):
+            self.m_Pending.add(path)
+        self.m_DelayTimer.start()
+
+    def _on_delay_timeout(self):
+        # 文件被替换(先写临时文件再改名)后监听会失效, 需要重新添加
+        files = self.m_Watcher.files()
+        for path in self.m_Paths:
+            if os.path.exists(path) and path not in files:
+                self.m_Watcher.addPath(path)
+        lPath, self.m_Pending = self.m_Pending, set()
+        for path in lPath:
+            if path not in self.m_Paths:
+                continue
+            sConfig = self.m_Paths[path]
+            print("配置文件被外部修改, 重新加载:", path)
+            self.m_Func(sConfig)
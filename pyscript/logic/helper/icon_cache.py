@@ -0,0 +1,84 @@
+# --*utf-8*--
+# Author：一念断星河
+# Crete Data：2026/10/19
+# Desc：不过是大梦一场空，不过是孤影照惊鸿。
+# 定时器图标缓存: 多个定时器共用同一张图标时只加载、缩放一次
+# 按 (路径, 尺寸, 设备像素比, 缩放方式) 缓存, 超出数量时淘汰最久未使用的, 文件修改后重新加载
+import os
+import threading
+from collections import OrderedDict
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage, QPixmap
+
+MaxImage = 32  # 解码后的原图数量
+MaxPixmap = 128  # 缩放后的图标数量
+
+if "g_Images" not in globals():
+    g_Images = OrderedDict()  # 图片路径 -> (修改时间, 解码好的 QImage), 后台线程也会写入
+    g_Pixmaps = OrderedDict()  # (图片路径, 尺寸, 设备像素比, 缩放方式) -> (修改时间, 缩放好的 QPixmap)
+    g_oLock = threading.Lock()
+
+
+def _GetMTime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _LoadImage(path, mtime):
+    # 读取原图, 已缓存且文件没有修改时直接返回
+    with g_oLock:
+        cache = g_Images.get(path, None)
+        if cache and cache[0] == mtime:
+            g_Images.move_to_end(path)
+            return cache[1]
+    image = QImage(path)
+    if image.isNull():
+        return None
+    with g_oLock:
+        g_Images[path] = (mtime, image)
+        g_Images.move_to_end(path)
+        while len(g_Images) > MaxImage:
+            g_Images.popitem(last=False)
+    return image
+
+
+def PreloadImage(path):
+    """
+    在后台线程解码图片, QPixmap 只能在主线程创建, 这里先解码成 QImage
+    """
+    mtime = _GetMTime(path)
+    if mtime is None:
+        return
+    _LoadImage(path, mtime)
+
+
+def GetPixmap(path, size, dpr=1.0, transform=Qt.SmoothTransformation):
+    """
+    获取缩放到指定尺寸的图标, 按屏幕的设备像素比缩放一次, 之后直接返回缓存
+    :param size: 逻辑尺寸
+    :param dpr: 设备像素比, 高分屏下按实际像素缩放
+    :return: 文件不存在时返回None
+    """
+    mtime = _GetMTime(path)
+    if mtime is None:
+        return None
+    key = (path, size, dpr, transform)
+    cache = g_Pixmaps.get(key, None)
+    if cache and cache[0] == mtime:
+        g_Pixmaps.move_to_end(key)
+        return cache[1]
+    image = _LoadImage(path, mtime)
+    if image is None:
+        return None
+    iPixel = max(1, round(size * dpr))
+    pixmap = QPixmap.fromImage(image.scaled(iPixel, iPixel, Qt.IgnoreAspectRatio, transform))
+    pixmap.setDevicePixelRatio(dpr)
+    g_Pixmaps[key] = (mtime, pixmap)
+    g_Pixmaps.move_to_end(key)
+    while len(g_Pixmaps) > MaxPixmap:
+        g_Pixmaps.popitem(last=False)
+    return pixmap
+
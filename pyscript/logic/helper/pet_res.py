@@ -3,8 +3,86 @@
 # Crete Data： 2024/12/1
 # Desc：不过是大梦一场空，不过是孤影照惊鸿。
 import os
+from collections import OrderedDict
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage, QImageReader, QPixmap
+
 from core.core_define import Path_PetRoot
 
+AnimExt = (".gif", ".webp", ".apng", ".png")  # 单文件动图支持的格式
+MaxAnim = 2  # 缓存解码帧的动图数量, 一般只有当前的宠物在播放
+
+if "g_Anim" not in globals():
+    g_Anim = OrderedDict()  # 动图路径 -> (修改时间, [QImage], [每帧时长MS])
+    g_PetIndex = {}  # 宠物目录名 -> (目录修改时间, PetRes)
+    g_RootIndex = (None, [])  # 宠物根目录 (修改时间, [宠物目录名])
+
+
+def _GetMTime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def LoadPets():
+    """
+    扫描宠物资源, 按目录修改时间缓存: 目录没有增删文件时直接使用上一次的结果
+    :return: 有资源的宠物列表
+    """
+    global g_RootIndex
+    mtime = _GetMTime(Path_PetRoot)
+    if mtime is None:
+        return []
+    if g_RootIndex[0] != mtime:
+        lName = [sName for sName in os.listdir(Path_PetRoot) if os.path.isdir(os.path.join(Path_PetRoot, sName))]
+        g_RootIndex = (mtime, lName)
+        for sName in list(g_PetIndex.keys()):
+            if sName not in lName:
+                del g_PetIndex[sName]
+    lPet = []
+    for sName in g_RootIndex[1]:
+        mtime = _GetMTime(os.path.join(Path_PetRoot, sName))
+        if mtime is None:
+            continue
+        cache = g_PetIndex.get(sName, None)
+        if not cache or cache[0] != mtime:
+            petRes = PetRes()
+            petRes.LoadRes(sName)
+            cache = g_PetIndex[sName] = (mtime, petRes)
+        if cache[1].HasRes():
+            lPet.append(cache[1])
+    return lPet
+
+
+def _DecodeAnim(path):
+    """
+    动图只解码一次, 所有宠物资源对象共用, 文件修改后重新解码
+    :return: ([QImage], [每帧时长MS, 没有时长的为None])
+    """
+    mtime = _GetMTime(path)
+    if mtime is None:
+        return [], []
+    cache = g_Anim.get(path, None)
+    if cache and cache[0] == mtime:
+        g_Anim.move_to_end(path)
+        return cache[1], cache[2]
+    lImage, lDelay = [], []
+    reader = QImageReader(path)
+    while reader.canRead():
+        image = reader.read()
+        if image.isNull():
+            break
+        lImage.append(image)
+        iDelay = reader.nextImageDelay()
+        lDelay.append(iDelay if iDelay > 0 else None)
+    g_Anim[path] = (mtime, lImage, lDelay)
+    g_Anim.move_to_end(path)
+    while len(g_Anim) > MaxAnim:
+        g_Anim.popitem(last=False)
+    return lImage, lDelay
+
 
 class PetRes:
     def __init__(self):
@@ -12,14 +90,35 @@ class PetRes:
         self.m_ResPath = ""
         self.m_ResCount = 0
         self.m_CurResIndex = 0
+        self.m_AnimPath = ""  # 单文件动图, 为空时使用 1.png..N.png 帧序列
+        self.m_Images = None  # 帧序列解码后的原图, 修改尺寸时只重新缩放
+        self.m_Frames = []  # 解码并缩放好的帧, 动画只切换下标
+        self.m_Delays = []  # 动图每帧的时长MS, 帧序列按设置的间隔播放
+        self.m_FrameKey = None  # 帧对应的 (尺寸, 设备像素比), 变化时重新生成
 
     def LoadRes(self, sFileName):
         self.m_ResName = sFileName
         self.m_ResPath = os.path.join(Path_PetRoot, sFileName)
+        lAnim = []
         for _path in os.listdir(str(self.m_ResPath)):
-            if not _path.endswith(".png"):
+            sName, sExt = os.path.splitext(_path)
+            if sExt.lower() == ".png" and sName.isdigit():
+                self.m_ResCount += 1
+            elif sExt.lower() in AnimExt:
+                lAnim.append(_path)
+        if self.m_ResCount:
+            return
+        # 没有帧序列时使用目录中的动图
+        for _path in sorted(lAnim):
+            sPath = os.path.join(self.m_ResPath, _path)
+            reader = QImageReader(sPath)
+            if not reader.canRead():
                 continue
-            self.m_ResCount += 1
+            self.m_AnimPath = sPath
+            # 部分格式读取前不知道帧数, 先按动图处理, 解码后再更新
+            iCount = reader.imageCount()
+            self.m_ResCount = iCount if iCount > 0 else (2 if reader.supportsAnimation() else 1)
+            return
 
     def HasRes(self):
         return bool(self.m_ResCount)
@@ -27,11 +126,65 @@ class PetRes:
     def IsNeedUpdate(self):
         return bool(self.m_ResCount > 1)
 
-    def GetNextRes(self):
+    def _LoadImages(self):
+        if self.m_AnimPath:
+            lImage, lDelay = _DecodeAnim(self.m_AnimPath)
+            self.m_ResCount = len(lImage)
+            return lImage, lDelay
+        if self.m_Images is None:
+            self.m_Images = []
+            for index in range(1, self.m_ResCount + 1):
+                image = QImage(os.path.join(self.m_ResPath, f"{index}.png"))
+                if not image.isNull():
+                    self.m_Images.append(image)
+        return self.m_Images, [None] * len(self.m_Images)
+
+    def GetFrames(self, size, dpr=1.0):
+        """
+        所有帧只解码、缩放一次, 尺寸或设备像素比变化时重新生成
+        """
+        key = (size, dpr)
+        if key == self.m_FrameKey:
+            return self.m_Frames
+        self.m_FrameKey = key
+        self.m_Frames = []
+        iPixel = max(1, round(size * dpr))
+        lImage, self.m_Delays = self._LoadImages()
+        for image in lImage:
+            pixmap = QPixmap.fromImage(image.scaled(iPixel, iPixel, Qt.IgnoreAspectRatio, Qt.SmoothTransformation))
+            pixmap.setDevicePixelRatio(dpr)
+            self.m_Frames.append(pixmap)
+        return self.m_Frames
+
+    def GetNextFrame(self, size, dpr=1.0):
+        frames = self.GetFrames(size, dpr)
+        if not frames:
+            return None
         self.m_CurResIndex += 1
-        if self.m_CurResIndex > self.m_ResCount:
+        if self.m_CurResIndex > len(frames):
             self.m_CurResIndex = 1
-        return os.path.join(self.m_ResPath, f"{self.m_CurResIndex}.png")
+        return frames[self.m_CurResIndex - 1]
+
+    def GetCurFrame(self, size, dpr=1.0):
+        frames = self.GetFrames(size, dpr)
+        if not frames:
+            return None
+        return frames[min(max(self.m_CurResIndex, 1), len(frames)) - 1]
+
+    def GetFrameDelay(self):
+        """
+        :return: 当前帧的时长MS, 没有时长(帧序列)时返回None
+        """
+        if 0 < self.m_CurResIndex <= len(self.m_Delays):
+            return self.m_Delays[self.m_CurResIndex - 1]
+        return None
+
+    def ClearFrames(self):
+        # 不再显示的宠物释放帧
+        self.m_Images = None
+        self.m_Frames = []
+        self.m_Delays = []
+        self.m_FrameKey = None
 
     def __repr__(self):
-        return f"PetRes: 名字-{self.m_ResName} 路径-{self.m_ResPath} 帧动画数量-{self.m_ResCount}"
\ No newline at end of file
+        return f"PetRes: 名字-{self.m_ResName} 路径-{self.m_AnimPath or self.m_ResPath} 帧动画数量-{self.m_ResCount}"
\ No newline at end of file
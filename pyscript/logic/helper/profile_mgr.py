@@ -0,0 +1,90 @@
+# --*utf-8*--
+# Author：一念断星河
+# Crete Data：2026/10/19
+# Desc：不过是大梦一场空，不过是孤影照惊鸿。
+# 配置方案: 最近使用的方案在后台预加载存档和图标, 切换时直接使用
+import os
+import threading
+
+from core import core_save, core_setting, core_event
+from core.core_define import Path_Timer, Path_Group, Path_IconRoot, SettingName
+from logic.helper import config_schema, icon_cache
+
+MaxRecent = 3  # 预加载最近使用的方案数量
+
+
+class ProfileMgr:
+    def __init__(self):
+        self.m_Preload = {}  # 方案名 -> {配置路径: (快照, 文件状态)}
+        self.m_oLock = threading.Lock()
+        self.m_Thread = None
+        self.m_dVersion = {}  # 方案名 -> 作废次数, 预加载期间有变化时丢弃读到的旧数据
+        core_event.BindEvent("PROFILE_SAVE", self.Invalidate, self)
+
+    @staticmethod
+    def GetName(profile):
+        return profile or "默认"
+
+    def GetProfiles(self):
+        return core_save.GetProfiles()
+
+    def GetRecent(self):
+        return [profile for profile in core_setting.Get(SettingName.RecentProfiles) if profile != core_save.GetProfile()]
+
+    def AddRecent(self, profile):
+        lRecent = [p for p in core_setting.Get(SettingName.RecentProfiles) if p != profile]
+        lRecent.insert(0, profile)
+        core_setting.Set(SettingName.RecentProfiles, lRecent[:MaxRecent + 1])
+
+    def StartPreload(self):
+        # 后台预加载最近使用的方案, 已在加载中时跳过
+        if self.m_Thread and self.m_Thread.is_alive():
+            return
+        lProfile = [p for p in self.GetRecent() if p in self.GetProfiles()]
+        with self.m_oLock:
+            lProfile = [p for p in lProfile if p not in self.m_Preload]
+        if not lProfile:
+            return
+        self.m_Thread = threading.Thread(target=self._Preload, args=(lProfile,), daemon=True)
+        self.m_Thread.start()
+
+    def _Preload(self, lProfile):
+        for profile in lProfile:
+            with self.m_oLock:
+                iVersion = self.m_dVersion.get(profile, 0)
+            # 后台只读取快照文件, 日志重放和文件状态的记录在切换时由主线程完成
+            dDoc = {path: core_save.LoadSnapshot(path, profile) for path in (Path_Group, Path_Timer)}
+            # 图标先解码, 切换时只需要在主线程转换成 QPixmap
+            for timer_data in (dDoc[Path_Timer][0] or {}).values():
+                if not isinstance(timer_data, dict) or not timer_data.get("bOpen") or not timer_data.get("bIconTimer"):
+                    continue
+                for sPic in (timer_data.get("sPic"), timer_data.get("sMaskPic")):
+                    if sPic and isinstance(sPic, str):
+                        icon_cache.PreloadImage(os.path.join(Path_IconRoot, sPic))
+            with self.m_oLock:
+                # 读取期间切换到了该方案或存档被修改, 读到的可能是旧数据
+                if self.m_dVersion.get(profile, 0) != iVersion or profile == core_save.GetProfile():
+                    continue
+                self.m_Preload[profile] = dDoc
+
+    def TakeDocs(self, profile):
+        """
+        取出预加载的方案存档, 没有预加载或预加载后文件被修改时直接读取
+        :return: {配置路径: 校验过的存档}
+        """
+        with self.m_oLock:
+            dPreload = self.m_Preload.pop(profile, None) or {}
+        dDoc = {}
+        for path in (Path_Group, Path_Timer):
+            data, stamp = dPreload.get(path, (None, None))
+            if data is None or core_save.FileStamp(path, profile) != stamp:
+                dDoc[path] = config_schema.LoadDoc(path, profile)
+                continue
+            dDoc[path] = config_schema.CheckDoc(path, core_save.AcceptSnapshot(path, data, stamp, profile))
+        return dDoc
+
+    def Invalidate(self, profile):
+        # 方案成为当前方案或存档被修改时调用
+        with self.m_oLock:
+            self.m_dVersion[profile] = self.m_dVersion.get(profile, 0) + 1
+            self.m_Preload.pop(profile, None)
@@ -1,28 +1,19 @@
-import os
 import sys
-import threading
-import time
-import weakref
-from collections import defaultdict
 from typing import List, Dict
 
 from PySide6.QtCore import *
 from PySide6.QtGui import *
 from PySide6.QtWidgets import *
 
-from pyscript.core import core_timer, core_save, core_input, core_voice, core_event
+from core import core_timer, core_save, core_input, core_voice, core_event, core_setting, core_cooldown, core_idle
 from core.core_define import *
-from core.core_input import KeyType
-from core.functor import CFunctor
-from logic.munu.menu_group import Group_Menu
-from logic.munu.menu_help import Help_Info
-from logic.munu.menu_setting import Setting_Menu
-from logic.munu.menu_timer import Timer_Menu
-from logic.munu.menu_voice import Voice_Menu
+from logic.munu.menu_main import Main_Menu
 from logic.timer.timer_group import GroupProxy
-from widgets.menu import RoundMenu, Action, FIF, MenuAnimationType
-from logic.helper.pet_res import PetRes
-from logic.timer.timer_info import TimerProxy
+from logic.helper import config_schema
+from logic.helper.config_watcher import ConfigWatcher
+from logic.helper.pet_res import PetRes, LoadPets
+from logic.helper.profile_mgr import ProfileMgr
+from logic.timer.timer_info import TimerProxy, EEffect
 
 
 class MainWindow(QLabel):
@@ -45,23 +36,41 @@ class MainWindow(QLabel):
         self.m_AEJump_Flag = False
         self.m_Cache = []
 
+        self.m_ProfileMgr = ProfileMgr()
+        self.m_MainMenu = Main_Menu(self)
+
         self.setup_ui()
+        profile = core_setting.Get(SettingName.Profile)
+        if profile not in core_save.GetProfiles():
+            profile = ""
+        core_save.SetProfile(profile)
+        config_schema.Migrate()
         self.load_pet()
         self.load_timer()
+        self.m_ConfigWatcher = ConfigWatcher([Path_Group, Path_Timer], self._on_config_file_change, self)
         self.show()
+        self.m_ProfileMgr.StartPreload()
+        self.m_MainMenu.start_prewarm()
         core_event.BindEvent("RELOAD_PET_RES", self.load_pet, self)
         core_event.BindEvent("RELOAD_TIMER", self.load_timer, self)
-        core_event.BindEvent("REOPEN_MENU", self.ReOpenMenu, self)
+        core_event.BindEvent("TIMER_GROUP_CHANGE", self._on_timer_group_change, self)
+        core_event.BindEvent("MOVE_GROUP_TIMERS", self._on_move_group_timers, self)
+        core_event.BindEvent("ANIMATION_SUSPEND", self._on_animation_suspend, self)
+        core_idle.AddVisibleCheck(self._is_pet_visible)
+        core_setting.BindSetting(SettingName.PetIconSize, self._on_pet_size_change, self)
+        core_setting.BindSetting(SettingName.PetIconUpdateTime, self._on_pet_update_time_change, self)
+        core_setting.BindSetting(SettingName.TimerReset, self._on_reset_key_change, self)
+        core_setting.BindSetting(SettingName.OverlayMode, self._on_overlay_mode_change, self)
 
         core_voice.Speak(f"欢迎使用星河定时器-饮江版，感谢星河大佬开源！")
 
     def update_pet_param(self):
-        data = core_save.LoadJson(Path_Setting)
-        icon_size = data.get(SettingName.PetIconSize, 72)
-        self._PixmapUpdateTime = data.get(SettingName.PetIconUpdateTime, 100)
+        settings = core_setting.g_Instance
+        icon_size = settings.pet_icon_size
+        self._PixmapUpdateTime = settings.pet_icon_update_time
         self._PixmapSize = icon_size
         w, h = icon_size, icon_size
-        icon_pos = data.get(SettingName.PetIconPos, None)
+        icon_pos = settings.pet_icon_pos
 
         # 最小区域
         min_point = QPoint()
@@ -119,29 +128,20 @@ class MainWindow(QLabel):
         mini_icon.show()
 
     def load_pet(self):
-        self.m_Pets.clear()
+        # 宠物资源按目录修改时间缓存, 没有变化时不会重新扫描
+        oldPet = self.m_CurPet
         self.m_CurPet = None
-        data = core_save.LoadJson(Path_Setting)
-        default_pet = data.get(SettingName.DefaultPetRes, "")
-        # 遍历宠物文件夹
-        for sPath in os.listdir(Path_PetRoot):
-            sCurPath = os.path.join(Path_PetRoot, sPath)
-            if not os.path.isdir(sCurPath):
-                continue
-            print("加载宠物资源目录：", sPath)
-            petRes = PetRes()
-            petRes.LoadRes(sPath)
-            if not petRes.HasRes():
-                continue
-            if not default_pet:
-                default_pet = sPath
-                data[SettingName.DefaultPetRes] = sPath
-                core_save.SaveJson(Path_Setting, data)
-            if default_pet == sPath:
+        self.m_Pets = LoadPets()
+        default_pet = core_setting.Get(SettingName.DefaultPetRes)
+        for petRes in self.m_Pets:
+            if petRes.m_ResName == default_pet:
                 self.m_CurPet = petRes
-            self.m_Pets.append(petRes)
+                break
         if not self.m_CurPet and self.m_Pets:
+            # 没有设置默认宠物时使用第一个, 用户选择后才写入设置
             self.m_CurPet = self.m_Pets[0]
+        if oldPet and oldPet is not self.m_CurPet:
+            oldPet.ClearFrames()
         if self.m_CurPet:
             print("当前宠物：", self.m_CurPet)
             self.update_pet_param()
@@ -150,76 +150,165 @@ class MainWindow(QLabel):
             self.quit()
 
     def refresh_cur_pet(self):
-        self.update_pixmap()
         self.m_PetUpdateTimer = None
+        self.update_pixmap()
         if self.m_CurPet.IsNeedUpdate():
-            self.m_PetUpdateTimer = core_timer.CreateAlwaysTimer(self._PixmapUpdateTime, self.update_pixmap)
+            self._schedule_pet_frame()
 
-    def load_timer(self):
-        # -------------------- 分组
-        self.m_AllGroup.clear()
-        data = core_save.LoadJson(Path_Group)
-        self.m_UuidGroup = 0
+    def _schedule_pet_frame(self):
+        # 动图按每帧自带的时长播放, 帧序列按设置的间隔播放
+        if core_idle.IsSuspend():
+            self.m_PetUpdateTimer = None
+            return
+        iDelay = self.m_CurPet.GetFrameDelay() or self._PixmapUpdateTime
+        self.m_PetUpdateTimer = core_timer.CreateTimer(iDelay, self._on_pet_frame, 1)
 
-        group = {}
-        for uid, timer_data in data.items():
-            uid = int(uid)
+    def _on_pet_frame(self):
+        self.update_pixmap()
+        self._schedule_pet_frame()
+
+    def load_timer(self):
+        """
+        按存档同步分组和定时器: 保留已有的定时器和悬浮窗, 只创建新增的、销毁删除的、刷新改动的字段
+        """
+        self.apply_group_doc(config_schema.LoadDoc(Path_Group))
+        # 关闭的定时器(sqlite后端)只读取摘要, 用到时再加载
+        data, lazy_data = config_schema.LoadLazy(Path_Timer)
+        self.apply_timer_doc(data, lazy_data)
+        if self.m_GlobalReSetKey is None:
+            self.register_reset_hotkey()
+
+    def switch_profile(self, profile):
+        """
+        切换配置方案: 使用预加载的存档, 在同一帧内按差异替换当前的定时器和热键
+        """
+        if profile == core_save.GetProfile():
+            return
+        self.m_ProfileMgr.AddRecent(core_save.GetProfile())
+        core_save.SetProfile(profile)
+        core_setting.Set(SettingName.Profile, profile)
+        config_schema.Migrate()
+        dDoc = self.m_ProfileMgr.TakeDocs(profile)
+        # 已成为当前方案, 后台还在读取的旧数据不再使用
+        self.m_ProfileMgr.Invalidate(profile)
+        self.apply_group_doc(dDoc[Path_Group])
+        self.apply_timer_doc(dDoc[Path_Timer])
+        self.m_ConfigWatcher.SetPaths([Path_Group, Path_Timer])
+        self.m_ProfileMgr.StartPreload()
+        core_voice.Speak(f"切换到配置方案{self.m_ProfileMgr.GetName(profile)}")
+
+    def _on_config_file_change(self, path):
+        # 配置文件被外部修改, 只应用有变化的部分
+        doc = config_schema.LoadDoc(path)
+        if path == Path_Group:
+            self.apply_group_doc(doc)
+        elif path == Path_Timer:
+            self.apply_timer_doc(doc)
+
+    def apply_group_doc(self, doc):
+        """
+        按分组id比较存档与当前分组, 只增删改有变化的分组
+        """
+        for uid in [uid for uid in self.m_AllGroup if str(uid) not in doc]:
+            del self.m_AllGroup[uid]
+        for key, group_data in doc.items():
+            uid = int(key)
             if self.m_UuidGroup <= uid:
                 self.m_UuidGroup = uid + 1
-            group[uid] = timer_data
-
-        for uid, group_data in group.items():
-            groupProxy = GroupProxy(uid, group_data)
-            self.m_AllGroup[uid] = groupProxy
-
-        # -------------------- 定时器
-        self.m_AllTimer.clear()
-        data = core_save.LoadJson(Path_Timer)
-        timer = {}
-        self.m_Uuid = 0
-
-        for uid, timer_data in data.items():
-            uid = int(uid)
+            group = self.m_AllGroup.get(uid, None)
+            if group:
+                group.ApplyData(group_data)
+                continue
+            group = GroupProxy(uid, group_data)
+            self.m_AllGroup[uid] = group
+            for timer in self.m_AllTimer.values():
+                if timer.m_groupId == uid:
+                    group.AddTimer(timer)
+        self.m_MainMenu.invalidate()
+
+    def apply_timer_doc(self, doc, lazy_doc=None):
+        """
+        按定时器id和字段比较存档与当前定时器, 只刷新有变化的部分:
+        颜色变化只重绘对应悬浮窗, 热键变化只重新绑定对应热键
+        :param lazy_doc: 只有摘要的定时器(关闭的), 不在内存中时创建懒加载的代理
+        """
+        lazy_doc = lazy_doc or {}
+        for uid in [uid for uid in self.m_AllTimer if str(uid) not in doc and str(uid) not in lazy_doc]:
+            self._remove_timer_proxy(uid)
+        for key, summary in lazy_doc.items():
+            uid = int(key)
             if self.m_Uuid <= uid:
                 self.m_Uuid = uid + 1
-            timer[uid] = timer_data
-        # core_save.SaveJson(Path_Timer, timer)
-        for uid, timer_data in timer.items():
-            timeProxy = TimerProxy(uid, timer_data)
-            self.m_AllTimer[uid] = timeProxy
-            if timeProxy.m_groupId in self.m_AllGroup:
-                self.m_AllGroup[timeProxy.m_groupId].m_lTimer.append(weakref.proxy(timeProxy))
+            timer = self.m_AllTimer.get(uid, None)
+            if not timer:
+                timer = TimerProxy(uid, summary, lazy=True)
+                self.m_AllTimer[uid] = timer
+                if timer.m_groupId in self.m_AllGroup:
+                    self.m_AllGroup[timer.m_groupId].AddTimer(timer)
+                continue
+            if not timer.m_bOpen and (timer.m_sName, timer.m_groupId) == (summary["sName"], summary["groupId"]):
+                continue  # 关闭的定时器摘要没变, 不用读取完整数据
+            iOldGroup = timer.m_groupId
+            if timer.ApplyData(config_schema.LoadItem(Path_Timer, uid)) & EEffect.Group:
+                self._move_timer_group(timer, iOldGroup)
+        for key, timer_data in doc.items():
+            uid = int(key)
+            if self.m_Uuid <= uid:
+                self.m_Uuid = uid + 1
+            timer = self.m_AllTimer.get(uid, None)
+            if not timer:
+                timer = TimerProxy(uid, timer_data)
+                self.m_AllTimer[uid] = timer
+                if timer.m_groupId in self.m_AllGroup:
+                    self.m_AllGroup[timer.m_groupId].AddTimer(timer)
+                continue
+            iOldGroup = timer.m_groupId
+            iEffect = timer.ApplyData(timer_data)
+            if iEffect & EEffect.Group:
+                self._move_timer_group(timer, iOldGroup)
+        self.m_MainMenu.invalidate()
+
+    def _remove_timer_proxy(self, uid):
+        timer = self.m_AllTimer.pop(uid, None)
+        if not timer:
+            return
+        if timer.m_groupId in self.m_AllGroup:
+            self.m_AllGroup[timer.m_groupId].RemoveTimer(uid)
+        timer.Destroy()
 
-        self.register_reset_hotkey()
+    def _on_timer_group_change(self, uid, iOldGroup):
+        timer = self.m_AllTimer.get(int(uid), None)
+        if timer:
+            self._move_timer_group(timer, iOldGroup)
+
+    def _move_timer_group(self, timer, iOldGroup):
+        if iOldGroup in self.m_AllGroup:
+            self.m_AllGroup[iOldGroup].RemoveTimer(timer.m_uuid)
+        if timer.m_groupId in self.m_AllGroup:
+            self.m_AllGroup[timer.m_groupId].AddTimer(timer)
 
     def register_reset_hotkey(self):
         # 全局重置
-        data = core_save.LoadJson(Path_Setting)
-        keys = data.get(SettingName.TimerReset, ["F2"])
+        keys = core_setting.Get(SettingName.TimerReset)
         self.m_GlobalReSetKey = core_input.RegisterHotKey(keys, self.reset_timer)
-         # === 新增：Qt 快捷键兜底（当窗口有焦点时也能触发） ===
-    try:
-        from PySide6.QtGui import QKeySequence, QShortcut
-        # keys 可能是 ["ctrl", "alt", "r"] 这种列表，这里转成 "ctrl+alt+r"
-        ks = "+".join(keys) if isinstance(keys, list) else str(keys)
-        if hasattr(self, "_qt_reset_shortcut") and self._qt_reset_shortcut:
-            self._qt_reset_shortcut.setKey(QKeySequence(ks))
-        else:
-            self._qt_reset_shortcut = QShortcut(QKeySequence(ks), self)
-            self._qt_reset_shortcut.activated.connect(self.reset_timer)
-        print(f"[ResetHotkey] registered: {ks} (keyboard + Qt fallback)")
-    except Exception as e:
-        print("Qt shortcut fallback failed:", e)
 
     def reset_timer(self):
-        for timer in self.m_AllTimer.values():
-            timer.Reset()
+        # 只处理正在冷却的定时器
+        for uid in core_cooldown.GetActive():
+            timer = self.m_AllTimer.get(uid, None)
+            if timer:
+                timer.Reset()
         core_voice.Speak(f"重置所有定时器！")
 
-    def update_pixmap(self):
-        self._Pixmap = QPixmap()
-        self._Pixmap.load(self.m_CurPet.GetNextRes())
-        self._Pixmap = self._Pixmap.scaled(QSize(self._PixmapSize, self._PixmapSize))
+    def update_pixmap(self, bNext=True):
+        # 帧已经预先解码缩放好, 这里只切换下一帧
+        if bNext:
+            pixmap = self.m_CurPet.GetNextFrame(self._PixmapSize, self.devicePixelRatioF())
+        else:
+            pixmap = self.m_CurPet.GetCurFrame(self._PixmapSize, self.devicePixelRatioF())
+        if not pixmap:
+            return
+        self._Pixmap = pixmap
         self.setPixmap(self._Pixmap)
 
     def mousePressEvent(self, QMouseEvent):
@@ -246,128 +335,90 @@ class MainWindow(QLabel):
         if e.button() == Qt.MouseButton.LeftButton:
             if not self.pos_first:
                 return
-            data = core_save.LoadJson(Path_Setting)
-            data[SettingName.PetIconPos] = [self.x, self.y]
-            core_save.SaveJson(Path_Setting, data)
+            core_setting.Set(SettingName.PetIconPos, [self.x, self.y])
 
     def OpenMenu(self, pos):
-        self.re_open_func = CFunctor(self.OpenMenu, pos)
-        menu = RoundMenu(parent=self)
-        newAction = Action(FIF.PENCIL_INK, '添加定时器')
-        newAction.triggered.connect(self._on_new_timer)
-        newAction.click_no_close = True
-        menu.addAction(newAction)
-
-        newAction = Action(FIF.PENCIL_INK, '添加分组')
-        newAction.triggered.connect(self._on_new_group)
-        newAction.click_no_close = True
-        menu.addAction(newAction)
-
-        # choose res
-        submenu = RoundMenu("宠物资源", self)
-        submenu.setIcon(FIF.ROBOT)
-        for pet_res in self.m_Pets:
-            _action = Action(pet_res.m_ResName)
-            _action.triggered.connect(CFunctor(self._on_choose_pet, pet_res))
-            submenu.addAction(_action)
-        menu.addMenu(submenu)
-
-        submenu = RoundMenu("语音播报", self)
-        submenu.setIcon(FIF.VOLUME)
-        voice_menu = Voice_Menu()
-        submenu.addWidget(voice_menu)
-        menu.addMenu(submenu)
-
-        submenu = RoundMenu("其他设置", self)
-        submenu.setIcon(FIF.SETTING)
-        setting_menu = Setting_Menu(self)
-        submenu.addWidget(setting_menu)
-        menu.addMenu(submenu)
-
-        submenu = RoundMenu("帮助信息", self)
-        submenu.setIcon(FIF.INFO)
-        help_info = Help_Info()
-        submenu.addWidget(help_info)
-        menu.addMenu(submenu)
-
-        menu.addSeparator()
-
-        # add actions
-        for timeProxy in self.m_AllTimer.values():
-            timeProxy: "TimerProxy"
-            if timeProxy.m_groupId in self.m_AllGroup:
-                continue
-            submenu = RoundMenu(timeProxy.m_sName, self)
-            submenu.setIcon(FIF.STOP_WATCH)
-            timermenu = Timer_Menu(timeProxy, CFunctor(submenu.DeepClose), CFunctor(self._on_del_timer))
-            submenu.addWidget(timermenu)
-            menu.addMenu(submenu)
-        for group in self.m_AllGroup.values():
-            menu.addSeparator()
-            sName = f"{group.m_sName}----{'开启' if group.m_bOpen else '关闭'}"
-            groupMenu = RoundMenu(sName, self)
-            # groupMenu.setIcon(FIF.FOLDER)
-            menu.addMenu(groupMenu)
-
-            groupMenu.addWidget(Group_Menu(group, CFunctor(groupMenu.DeepClose), CFunctor(self._on_del_group)))
-
-            for timeProxy in group.m_lTimer:
-                timeProxy: "TimerProxy"
-                timeProxy = self.m_AllTimer[timeProxy.m_uuid]
-                timerMenu = RoundMenu(timeProxy.m_sName, self)
-                timerMenu.setIcon(FIF.STOP_WATCH)
-                timerSetting = Timer_Menu(timeProxy, CFunctor(timerMenu.DeepClose), CFunctor(self._on_del_timer))
-                timerMenu.addWidget(timerSetting)
-                menu.addMenu(timerMenu)
-        menu.addSeparator()
-        newAction = Action(FIF.CLOSE, '关闭')
-        newAction.triggered.connect(self.quit)
-        menu.addAction(newAction)
-
-        # show menu
-        menu.exec(pos, ani=False)
+        self.m_MainMenu.show_menu(pos)
 
     # region menu callback
     def _on_new_timer(self):
         self.m_Uuid += 1
         x, y = QCursor.pos().toTuple()
-        timer = TimerProxy(str(self.m_Uuid), {"tPos":(x, y), "sPic":"icon.png", "bOpen":True}  )
+        data = config_schema.NewItem(Path_Timer, tPos=[x, y], sPic="icon.png", bOpen=True)
+        timer = TimerProxy(str(self.m_Uuid), data, bSaved=False)
         timer.Save()
         self.m_AllTimer[timer.m_uuid] = timer
-        if self.re_open_func:
-            self.re_open_func()
-
-    def ReOpenMenu(self):
-        if self.re_open_func:
-            self.re_open_func()
+        if timer.m_groupId in self.m_AllGroup:
+            self.m_AllGroup[timer.m_groupId].AddTimer(timer)
+        # 菜单保持打开, 只加入新的条目
+        self.m_MainMenu.sync()
 
     def _on_new_group(self):
         self.m_UuidGroup += 1
-        group = GroupProxy(str(self.m_UuidGroup), {})
+        group = GroupProxy(str(self.m_UuidGroup), config_schema.NewItem(Path_Group), bSaved=False)
         group.Save()
         self.m_AllGroup[group.m_uuid] = group
-        if self.re_open_func:
-            self.re_open_func()
+        self.m_MainMenu.sync()
+
+    def _on_new_profile(self):
+        lProfile = self.m_ProfileMgr.GetProfiles()
+        index = len(lProfile)
+        while f"方案{index}" in lProfile:
+            index += 1
+        profile = f"方案{index}"
+        core_save.CreateProfile(profile)
+        self.switch_profile(profile)
 
     def _on_choose_pet(self, pet):
+        if self.m_CurPet and self.m_CurPet is not pet:
+            self.m_CurPet.ClearFrames()
         self.m_CurPet = pet
         self.m_CurPet.m_CurResIndex = 1
         self.refresh_cur_pet()
-        data = core_save.LoadJson(Path_Setting)
-        data[SettingName.DefaultPetRes] = pet.m_ResName
-        core_save.SaveJson(Path_Setting, data)
+        core_setting.Set(SettingName.DefaultPetRes, pet.m_ResName)
         print("切换宠物：", pet)
 
+    def _on_pet_size_change(self, size):
+        # 只改变窗口大小并重新缩放当前宠物的帧, 不重新扫描资源
+        self._PixmapSize = size
+        if not self.m_CurPet:
+            return
+        self.resize(size, size)
+        self.update_pixmap(False)
+
+    def _on_pet_update_time_change(self, iTime):
+        # 正在播放的动画按新的间隔继续, 不重新加载
+        self._PixmapUpdateTime = iTime
+        if self.m_PetUpdateTimer:
+            self._schedule_pet_frame()
+
+    def _is_pet_visible(self):
+        return self.isVisible() and not self.isMinimized()
+
+    def _on_animation_suspend(self, bSuspend):
+        # 锁屏、看不到或长时间没有操作时暂停宠物动画和冷却扫描, 倒计时照常进行
+        if bSuspend:
+            self.m_PetUpdateTimer = None
+            return
+        if self.m_CurPet and self.m_CurPet.IsNeedUpdate():
+            self._schedule_pet_frame()
+        # 冷却扫描下一帧立即恢复, 不用等到文字变化
+        for uid in core_cooldown.GetActive():
+            core_cooldown.Wake(uid)
+
+    def _on_reset_key_change(self, keys):
+        self.register_reset_hotkey()
+
+    def _on_overlay_mode_change(self, bOverlay):
+        for timer in self.m_AllTimer.values():
+            timer.RecreateFlyView()
+
     def _on_del_timer(self, index):
         try:
-            index = str(index)
-            data = core_save.LoadJson(Path_Timer)
-
-            if index not in data:
+            if int(index) not in self.m_AllTimer:
                 return
-            del data[index]
-            core_save.SaveJson(Path_Timer, data)
-            self.load_timer()
+            core_save.DeleteKey(Path_Timer, index)
+            self._remove_timer_proxy(int(index))
         except IOError as e:
             print("删除定时器报错：", e)
             pass
@@ -375,30 +426,24 @@ class MainWindow(QLabel):
     def _on_del_group(self, uid):
         uid = int(uid)
         try:
-            key = str(uid)
-            data = core_save.LoadJson(Path_Group)
-            if key not in data:
+            delGroup = self.m_AllGroup.pop(uid, None)
+            if not delGroup:
                 print("没有这个分组!!")
                 return
-            del data[key]
-            core_save.SaveJson(Path_Group, data)
-            delGroup = self.m_AllGroup.get(uid, None)
-            print("当前分组定时器:", delGroup, self.m_AllGroup)
-            if delGroup:
-                data = core_save.LoadJson(Path_Timer)
-                for timer in delGroup.m_lTimer:
-                    print("删除组内定时器:", timer.m_uuid, timer.m_sName)
-                    key = str(timer.m_uuid)
-                    if key not in data:
-                        continue
-                    print("-----删除组内定时器:", timer.m_uuid, timer.m_sName)
-                    del data[key]
-                core_save.SaveJson(Path_Timer, data)
-            self.load_timer()
+            # 分组和组内定时器的存档一次写入
+            for timer_uid in delGroup.Delete():
+                print("删除组内定时器:", timer_uid)
+                self._remove_timer_proxy(timer_uid)
         except IOError as e:
             print("删除定时器报错：", e)
             pass
 
+    def _on_move_group_timers(self, uid, iGroupId):
+        group = self.m_AllGroup.get(int(uid), None)
+        if not group:
+            return
+        group.MoveTimers(iGroupId, self.m_AllGroup.get(iGroupId, None))
+
 
     # endregion
 
@@ -3,6 +3,7 @@
 # Crete Data：2024/6/4
 # Desc：不过是大梦一场空，不过是孤影照惊鸿。
 import weakref
+from PySide6.QtGui import QIntValidator
 from PySide6.QtWidgets import *
 
 from core import core_event
@@ -57,6 +58,17 @@ class Group_Menu(QWidget):
         self.layout_name.addWidget(self.edit_name)
         self.layout_main.addLayout(self.layout_name)
 
+        # 组内定时器移动到其他分组
+        self.layout_move = QHBoxLayout()
+        self.label_move = QLabel("移动到分组")
+        self.layout_move.addWidget(self.label_move)
+        self.edit_move = LineEdit(self)
+        self.edit_move.setValidator(QIntValidator())
+        self.edit_move.setPlaceholderText('请输入分组ID')
+        self.edit_move.editingFinished.connect(self.on_move_timers)
+        self.layout_move.addWidget(self.edit_move)
+        self.layout_main.addLayout(self.layout_move)
+
         self.button_delete = PrimaryPushButton("删除分组", self)
         self.button_delete.clicked.connect(self.on_delete)
         self.button_delete.setStyleSheet("background-color: red; color: white;border-radius:5px;")
@@ -66,8 +78,8 @@ class Group_Menu(QWidget):
 
     def OnChangeSwitch(self, switch):
         self.groupInfo.ChangeSwitch(switch)
-        self.close_menu_func()
-        core_event.TriggerEvent("REOPEN_MENU")
+        # 组内定时器的开关跟着变化, 重建它们的设置界面
+        core_event.TriggerEvent("REFRESH_MENU", [timer.m_uuid for timer in self.groupInfo.GetTimers()])
 
     def on_name_change(self):
         sText = self.edit_name.text()
@@ -75,16 +87,21 @@ class Group_Menu(QWidget):
             return
         self.groupInfo.m_sName = sText
         self.groupInfo.Save()
-        self.close_menu_func()
-        core_event.TriggerEvent("REOPEN_MENU")
+        core_event.TriggerEvent("REFRESH_MENU")
         pass
 
 
+    def on_move_timers(self):
+        sText = self.edit_move.text()
+        if not sText:
+            return
+        lUid = [timer.m_uuid for timer in self.groupInfo.GetTimers()]
+        core_event.TriggerEvent("MOVE_GROUP_TIMERS", self.groupInfo.m_uuid, int(sText))
+        core_event.TriggerEvent("REFRESH_MENU", lUid)
+
     def on_delete(self):
         print("准备删除：", self.groupInfo.m_uuid)
-        self.groupInfo.ChangeSwitch(False)
         self.del_group_func(self.groupInfo.m_uuid)
-        self.close_menu_func()
-        core_event.TriggerEvent("REOPEN_MENU")
+        core_event.TriggerEvent("REFRESH_MENU")
         pass
 
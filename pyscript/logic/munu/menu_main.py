@@ -0,0 +1,274 @@
+# --*utf-8*--
+# Author：一念断星河
+# Crete Data：2026/10/19
+# Desc：不过是大梦一场空，不过是孤影照惊鸿。
+# 右键主菜单: 只创建一次, 之后按改动更新受影响的条目, 不再关闭后整体重建
+# 定时器和分组的子菜单按id保留, 增删或移动时只重新排列条目, 已创建的设置界面不会重建
+import weakref
+from typing import TYPE_CHECKING
+
+from PySide6.QtCore import QTimer
+
+from core import core_event, core_save
+from core.functor import CFunctor
+from logic.munu.menu_group import Group_Menu
+from logic.munu.menu_help import Help_Info
+from logic.munu.menu_setting import Setting_Menu
+from logic.munu.menu_timer import Timer_Menu
+from logic.munu.menu_voice import Voice_Menu
+from widgets.menu import RoundMenu, Action, FIF
+
+if TYPE_CHECKING:
+    from logic.main_window import MainWindow
+
+PrewarmDelayMs = 500  # 启动后多久预先创建菜单, 避开启动时的加载
+
+
+def _GroupTitle(group):
+    return f"{group.m_sName}----{'开启' if group.m_bOpen else '关闭'}"
+
+
+class Main_Menu:
+    def __init__(self, owner):
+        self.m_Owner = weakref.ref(owner)
+        self.m_Menu: "RoundMenu" = None
+        self.m_PetMenu: "RoundMenu" = None
+        self.m_ProfileMenu: "RoundMenu" = None
+        self.m_iHeadCount = 0  # 固定部分的条目数, 之后是定时器和分组
+        self.m_Layout = None  # 定时器和分组条目的排列, 变化时才重新排列
+        self.m_PetKey = None  # 宠物列表, 没有变化时不重建
+        self.m_ProfileKey = None  # 配置方案列表和当前方案, 没有变化时不重建
+        self.m_dTimerEntry = {}  # 定时器id -> 子菜单
+        self.m_dGroupEntry = {}  # 分组id -> 子菜单
+        self.m_dTimerIcon = {}  # 已创建设置界面的定时器id -> 创建时是否为图标定时器
+        core_event.BindEvent("REFRESH_MENU", self.sync, self)
+
+    @property
+    def owner(self) -> "MainWindow":
+        return self.m_Owner()
+
+    def build(self):
+        # 固定部分只创建一次
+        if self.m_Menu:
+            return
+        owner = self.owner
+        menu = self.m_Menu = RoundMenu(parent=owner)
+        newAction = Action(FIF.PENCIL_INK, '添加定时器')
+        newAction.triggered.connect(owner._on_new_timer)
+        newAction.click_no_close = True
+        menu.addAction(newAction)
+
+        newAction = Action(FIF.PENCIL_INK, '添加分组')
+        newAction.triggered.connect(owner._on_new_group)
+        newAction.click_no_close = True
+        menu.addAction(newAction)
+
+        self.m_PetMenu = RoundMenu("宠物资源", menu)
+        self.m_PetMenu.setIcon(FIF.ROBOT)
+        menu.addMenu(self.m_PetMenu)
+
+        self.m_ProfileMenu = RoundMenu("配置方案", menu)
+        self.m_ProfileMenu.setIcon(FIF.FOLDER)
+        menu.addMenu(self.m_ProfileMenu)
+
+        # 子菜单的内容在第一次显示时才创建, 打开菜单的耗时与定时器数量无关
+        submenu = RoundMenu("语音播报", menu)
+        submenu.setIcon(FIF.VOLUME)
+        submenu.setLazyContent(lambda _menu: _menu.addWidget(Voice_Menu()))
+        menu.addMenu(submenu)
+
+        submenu = RoundMenu("其他设置", menu)
+        submenu.setIcon(FIF.SETTING)
+        submenu.setLazyContent(lambda _menu: _menu.addWidget(Setting_Menu(owner)))
+        menu.addMenu(submenu)
+
+        submenu = RoundMenu("帮助信息", menu)
+        submenu.setIcon(FIF.INFO)
+        submenu.setLazyContent(lambda _menu: _menu.addWidget(Help_Info()))
+        menu.addMenu(submenu)
+
+        menu.addSeparator()
+        self.m_iHeadCount = menu.view.count()
+
+    def start_prewarm(self):
+        QTimer.singleShot(PrewarmDelayMs, self.prewarm)
+
+    def prewarm(self):
+        """
+        空闲时预先创建菜单骨架、应用样式并创建窗口, 第一次右键和之后一样快
+        """
+        if not self.m_Owner():
+            return
+        self.build()
+        self._refresh_pets()
+        self._refresh_profiles()
+        self.sync()
+        for menu in (self.m_Menu, self.m_PetMenu, self.m_ProfileMenu):
+            menu.ensurePolished()
+            menu.view.ensurePolished()
+        self.m_Menu.winId()
+
+    def show_menu(self, pos):
+        self.build()
+        self._refresh_pets()
+        self._refresh_profiles()
+        self.sync()
+        self.m_Menu.exec(pos, ani=False)
+
+    def _refresh_pets(self):
+        owner = self.owner
+        key = tuple(owner.m_Pets)
+        if key == self.m_PetKey:
+            return
+        self.m_PetKey = key
+        self.m_PetMenu.clear()
+        for pet_res in owner.m_Pets:
+            _action = Action(pet_res.m_ResName)
+            _action.triggered.connect(CFunctor(owner._on_choose_pet, pet_res))
+            self.m_PetMenu.addAction(_action)
+
+    def _refresh_profiles(self):
+        owner = self.owner
+        lProfile = owner.m_ProfileMgr.GetProfiles()
+        key = (tuple(lProfile), core_save.GetProfile())
+        if key == self.m_ProfileKey:
+            return
+        self.m_ProfileKey = key
+        self.m_ProfileMenu.clear()
+        for profile in lProfile:
+            sName = owner.m_ProfileMgr.GetName(profile)
+            if profile == core_save.GetProfile():
+                sName = f"{sName}(当前)"
+            _action = Action(sName)
+            _action.triggered.connect(CFunctor(owner.switch_profile, profile))
+            self.m_ProfileMenu.addAction(_action)
+        _action = Action(FIF.ADD, "新建配置方案")
+        _action.triggered.connect(owner._on_new_profile)
+        self.m_ProfileMenu.addAction(_action)
+
+    def _get_layout(self):
+        # 未分组的定时器在前, 之后每个分组后面跟着组内的定时器
+        owner = self.owner
+        lLayout = []
+        for timer in owner.m_AllTimer.values():
+            if timer.m_groupId not in owner.m_AllGroup:
+                lLayout.append(("timer", timer.m_uuid))
+        for group in owner.m_AllGroup.values():
+            lLayout.append(("group", group.m_uuid))
+            for timer in group.GetTimers():
+                if timer.m_uuid in owner.m_AllTimer:
+                    lLayout.append(("timer", timer.m_uuid))
+        return lLayout
+
+    def sync(self, lTimerUid=()):
+        """
+        按当前的定时器和分组更新菜单: 删除的条目移除, 改名的只改标题, 有增删或移动时重新排列
+        :param lTimerUid: 设置被其他界面修改的定时器(分组开关、移动分组、增删热键), 重建它们的设置界面
+        """
+        if not self.m_Menu:
+            return
+        owner = self.owner
+        lLayout = self._get_layout()
+        setTimer = {uid for sType, uid in lLayout if sType == "timer"}
+        setGroup = {uid for sType, uid in lLayout if sType == "group"}
+        for uid in [uid for uid in self.m_dTimerEntry if uid not in setTimer]:
+            self.m_dTimerIcon.pop(uid, None)
+            self._drop_entry(self.m_dTimerEntry.pop(uid))
+        for uid in [uid for uid in self.m_dGroupEntry if uid not in setGroup]:
+            self._drop_entry(self.m_dGroupEntry.pop(uid))
+
+        for uid, submenu in self.m_dTimerEntry.items():
+            timer = owner.m_AllTimer[uid]
+            if submenu.title() != timer.m_sName:
+                submenu.setTitle(timer.m_sName)
+            # 文字/图标模式的设置项不同, 或设置被其他界面修改, 只重建这一个定时器的设置界面
+            if uid in self.m_dTimerIcon and (self.m_dTimerIcon[uid] != timer.m_bIconTimer or uid in lTimerUid):
+                self._reset_timer_entry(uid)
+        for uid, submenu in self.m_dGroupEntry.items():
+            sTitle = _GroupTitle(owner.m_AllGroup[uid])
+            if submenu.title() != sTitle:
+                submenu.setTitle(sTitle)
+
+        if lLayout != self.m_Layout:
+            self.m_Layout = lLayout
+            self._relayout(lLayout)
+
+    def invalidate(self):
+        """
+        定时器或分组被外部修改(配置文件、切换方案), 已创建的设置界面在下次显示时重新创建
+        """
+        if not self.m_Menu:
+            return
+        owner = self.owner
+        self.sync()
+        for uid, submenu in self.m_dTimerEntry.items():
+            if submenu.isContentBuilt():
+                self._reset_timer_entry(uid)
+        for uid, submenu in self.m_dGroupEntry.items():
+            if submenu.isContentBuilt():
+                self._reset_group_entry(owner.m_AllGroup[uid], submenu)
+
+    def _relayout(self, lLayout):
+        # 移除定时器部分的条目后按顺序重新加入, 子菜单对象和已创建的内容保留
+        owner = self.owner
+        menu = self.m_Menu
+        menu.takeItemsFrom(self.m_iHeadCount)
+        for sType, uid in lLayout:
+            if sType == "group":
+                menu.addSeparator()
+                menu.addMenu(self._get_group_entry(owner.m_AllGroup[uid]))
+            else:
+                menu.addMenu(self._get_timer_entry(owner.m_AllTimer[uid]))
+        menu.addSeparator()
+        closeAction = Action(FIF.CLOSE, '关闭')
+        closeAction.triggered.connect(owner.quit)
+        menu.addAction(closeAction)
+
+    def _get_timer_entry(self, timer):
+        submenu = self.m_dTimerEntry.get(timer.m_uuid, None)
+        if submenu is None:
+            submenu = self.m_dTimerEntry[timer.m_uuid] = RoundMenu(timer.m_sName, self.m_Menu)
+            submenu.setIcon(FIF.STOP_WATCH)
+            submenu.setLazyContent(CFunctor(self._build_timer_menu, timer.m_uuid))
+        return submenu
+
+    def _get_group_entry(self, group):
+        submenu = self.m_dGroupEntry.get(group.m_uuid, None)
+        if submenu is None:
+            submenu = self.m_dGroupEntry[group.m_uuid] = RoundMenu(_GroupTitle(group), self.m_Menu)
+            submenu.setLazyContent(CFunctor(self._build_group_menu, group.m_uuid))
+        return submenu
+
+    def _build_timer_menu(self, uid, submenu):
+        timer = self.owner.m_AllTimer.get(uid, None)
+        if not timer:
+            return
+        self.m_dTimerIcon[uid] = timer.m_bIconTimer
+        submenu.addWidget(Timer_Menu(timer, CFunctor(submenu.DeepClose), CFunctor(self.owner._on_del_timer)))
+
+    def _build_group_menu(self, uid, submenu):
+        group = self.owner.m_AllGroup.get(uid, None)
+        if not group:
+            return
+        submenu.addWidget(Group_Menu(group, CFunctor(submenu.DeepClose), CFunctor(self.owner._on_del_group)))
+
+    def _reset_timer_entry(self, uid):
+        self.m_dTimerIcon.pop(uid, None)
+        self._reset_content(self.m_dTimerEntry[uid], CFunctor(self._build_timer_menu, uid))
+
+    def _reset_group_entry(self, group, submenu):
+        self._reset_content(submenu, CFunctor(self._build_group_menu, group.m_uuid))
+
+    @staticmethod
+    def _reset_content(submenu, buildFunc):
+        # 正在显示的立即重建, 否则等下次显示
+        submenu.clear()
+        submenu.setLazyContent(buildFunc)
+        if submenu.isVisible():
+            submenu.ensureContent()
+
+    @staticmethod
+    def _drop_entry(submenu):
+        # 编辑回调可能还在这个子菜单里执行, 延迟销毁
+        submenu.hide()
+        submenu.deleteLater()
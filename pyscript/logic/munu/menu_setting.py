@@ -7,8 +7,8 @@ import weakref
 from PySide6.QtGui import QIntValidator
 from PySide6.QtWidgets import *
 
-from core import core_input, core_save, core_timer, core_event
-from core.core_define import Path_Setting, SettingName
+from core import core_input, core_timer, core_setting
+from core.core_define import SettingName
 from widgets.button import PrimaryPushButton
 from widgets.line_edit import LineEdit
 from widgets.switch_button import SwitchButton
@@ -26,8 +26,8 @@ class Setting_Menu(QWidget):
         self.layout_main.setContentsMargins(10, 10, 10, 10)
         self.layout_main.setSpacing(10)
 
-        data = core_save.LoadJson(Path_Setting)
-        size = data.get(SettingName.PetIconSize, 72)
+        settings = core_setting.g_Instance
+        size = settings.pet_icon_size
         self.layout_size = QHBoxLayout()
         self.label_size = QLabel("悬浮图标尺寸")
         self.layout_size.addWidget(self.label_size)
@@ -39,8 +39,7 @@ class Setting_Menu(QWidget):
         self.layout_size.addWidget(self.edit_size)
         self.layout_main.addLayout(self.layout_size)
 
-        data = core_save.LoadJson(Path_Setting)
-        iTime = data.get(SettingName.PetIconUpdateTime, 100)
+        iTime = settings.pet_icon_update_time
         self.layout_update_time = QHBoxLayout()
         self.label_update_time = QLabel("悬浮图标刷新时间间隔(毫秒)")
         self.layout_update_time.addWidget(self.label_update_time)
@@ -57,7 +56,7 @@ class Setting_Menu(QWidget):
         self.label_time = QLabel("热键超时(ms)")
         self.layout_time.addWidget(self.label_time)
         self.edit_time = LineEdit(self)
-        self.edit_time.setText(str(core_input.g_HotKeyTimeOut))
+        self.edit_time.setText(str(settings.timer_reset_time))
         self.edit_time.setValidator(QIntValidator(self.edit_time))
         self.edit_time.setClearButtonEnabled(True)
         self.edit_time.textChanged.connect(self.on_hotkey_timeout_change)
@@ -65,8 +64,7 @@ class Setting_Menu(QWidget):
         self.layout_main.addLayout(self.layout_time)
 
         # 修改按键
-        data = core_save.LoadJson(Path_Setting)
-        sKey = data.get(SettingName.TimerReset, ["F2"])
+        sKey = settings.timer_reset
         self.layout_key = QHBoxLayout()
         self.label_key = QLabel("一键重置所有定时器")
         self.layout_key.addWidget(self.label_key)
@@ -78,29 +76,80 @@ class Setting_Menu(QWidget):
         self.edit_keys.Released.connect(self.on_record_keys)
         self.layout_key.addWidget(self.edit_keys)
         self.layout_main.addLayout(self.layout_key)
+
+        # 合成模式: 所有定时器画在一个窗口里, 定时器多时减少游戏掉帧
+        self.layout_overlay = QHBoxLayout()
+        self.label_overlay = QLabel("合成模式(单窗口)")
+        self.layout_overlay.addWidget(self.label_overlay)
+        self.button_overlay = SwitchButton("", "")
+        self.button_overlay.setChecked(settings.overlay_mode)
+        self.button_overlay.checkedChanged.connect(self.on_overlay_mode_change)
+        self.layout_overlay.addWidget(self.button_overlay)
+        self.layout_main.addLayout(self.layout_overlay)
+
+        # 冷却扫描帧率
+        self.layout_sweep = QHBoxLayout()
+        self.label_sweep = QLabel("冷却扫描帧率(0为关闭)")
+        self.layout_sweep.addWidget(self.label_sweep)
+        self.edit_sweep = LineEdit(self)
+        self.edit_sweep.setText(str(settings.sweep_fps))
+        self.edit_sweep.setValidator(QIntValidator(0, 120, self.edit_sweep))
+        self.edit_sweep.setClearButtonEnabled(True)
+        self.edit_sweep.textChanged.connect(self.on_sweep_fps_change)
+        self.layout_sweep.addWidget(self.edit_sweep)
+        self.layout_main.addLayout(self.layout_sweep)
+
+        # 逻辑更新间隔和渲染帧率
+        self.layout_tick = QHBoxLayout()
+        self.label_tick = QLabel("逻辑更新间隔(ms)")
+        self.layout_tick.addWidget(self.label_tick)
+        self.edit_tick = LineEdit(self)
+        self.edit_tick.setText(str(settings.engine_tick_ms))
+        self.edit_tick.setValidator(QIntValidator(1, 100, self.edit_tick))
+        self.edit_tick.setClearButtonEnabled(True)
+        self.edit_tick.textChanged.connect(self.on_engine_tick_change)
+        self.layout_tick.addWidget(self.edit_tick)
+        self.layout_main.addLayout(self.layout_tick)
+
+        self.layout_render = QHBoxLayout()
+        self.label_render = QLabel("渲染帧率")
+        self.layout_render.addWidget(self.label_render)
+        self.edit_render = LineEdit(self)
+        self.edit_render.setText(str(settings.render_fps))
+        self.edit_render.setValidator(QIntValidator(1, 240, self.edit_render))
+        self.edit_render.setClearButtonEnabled(True)
+        self.edit_render.textChanged.connect(self.on_render_fps_change)
+        self.layout_render.addWidget(self.edit_render)
+        self.layout_main.addLayout(self.layout_render)
+
+        # 空闲多久后暂停宠物动画和冷却扫描
+        self.layout_idle = QHBoxLayout()
+        self.label_idle = QLabel("空闲暂停动画(秒, 0为关闭)")
+        self.layout_idle.addWidget(self.label_idle)
+        self.edit_idle = LineEdit(self)
+        self.edit_idle.setText(str(settings.idle_suspend_sec))
+        self.edit_idle.setValidator(QIntValidator(0, 86400, self.edit_idle))
+        self.edit_idle.setClearButtonEnabled(True)
+        self.edit_idle.textChanged.connect(self.on_idle_suspend_change)
+        self.layout_idle.addWidget(self.edit_idle)
+        self.layout_main.addLayout(self.layout_idle)
         self.adjustSize()
 
     def on_app_size_change(self, sText):
         if not sText:
             sText = 16
-        data = core_save.LoadJson(Path_Setting)
         size = int(sText)
         if size < 16:
             size = 16
-        data[SettingName.PetIconSize] = size
-        core_save.SaveJson(Path_Setting, data)
-        core_event.TriggerEvent("RELOAD_PET_RES")
+        core_setting.Set(SettingName.PetIconSize, size)
 
     def on_app_update_time_change(self, sText):
         if not sText:
             sText = 16
-        data = core_save.LoadJson(Path_Setting)
         iTime = int(sText)
         if iTime < 16:
             iTime = 16
-        data[SettingName.PetIconUpdateTime] = iTime
-        core_save.SaveJson(Path_Setting, data)
-        core_event.TriggerEvent("RELOAD_PET_RES")
+        core_setting.Set(SettingName.PetIconUpdateTime, iTime)
 
     def on_hotkey_timeout_change(self, sText):
         if not sText:
@@ -109,10 +158,30 @@ class Setting_Menu(QWidget):
             int(sText)
         except:
             sText = 2000
-        core_input.g_HotKeyTimeOut = int(sText)
-        data = core_save.LoadJson(Path_Setting)
-        data[SettingName.TimerResetTime] = int(sText)
-        core_save.SaveJson(Path_Setting, data)
+        core_setting.Set(SettingName.TimerResetTime, int(sText))
+
+    def on_overlay_mode_change(self, bOverlay):
+        core_setting.Set(SettingName.OverlayMode, bOverlay)
+
+    def on_sweep_fps_change(self, sText):
+        if not sText:
+            return
+        core_setting.Set(SettingName.SweepFps, min(int(sText), 120))
+
+    def on_engine_tick_change(self, sText):
+        if not sText:
+            return
+        core_setting.Set(SettingName.EngineTickMs, max(1, min(int(sText), 100)))
+
+    def on_render_fps_change(self, sText):
+        if not sText:
+            return
+        core_setting.Set(SettingName.RenderFps, max(1, min(int(sText), 240)))
+
+    def on_idle_suspend_change(self, sText):
+        if not sText:
+            return
+        core_setting.Set(SettingName.IdleSuspendSec, max(0, int(sText)))
 
     def on_record_keys(self):
         print("开始记录热键")
@@ -133,9 +202,7 @@ class Setting_Menu(QWidget):
         if not self._cache_keys:
             self._cache_keys = ["F2"]
         sKey = f"{'、'.join(self._cache_keys)}" if self._cache_keys else ""
-        data = core_save.LoadJson(Path_Setting)
-        data[SettingName.TimerReset] = self._cache_keys
-        core_save.SaveJson(Path_Setting, data)
+        # 主窗口监听了设置修改, 会重新注册重置热键
+        core_setting.Set(SettingName.TimerReset, self._cache_keys)
         self._cache_keys = []
         self.edit_keys.setText(sKey)
-        self.m_ParentProxy.register_reset_hotkey()
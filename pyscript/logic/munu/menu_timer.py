@@ -147,6 +147,28 @@ class Timer_Menu(QWidget):
         self.layout_time.addWidget(self.edit_time)
         self.layout_main.addLayout(self.layout_time)
 
+        # 最后几秒显示十分之一秒
+        self.layout_tenths = QHBoxLayout()
+        self.label_tenths = QLabel("最后几秒显示0.1秒")
+        self.layout_tenths.addWidget(self.label_tenths)
+        self.button_tenths = SwitchButton("", "")
+        self.button_tenths.setChecked(timer_info.m_bTenths)
+        self.button_tenths.checkedChanged.connect(self.on_tenths_change)
+        self.layout_tenths.addWidget(self.button_tenths)
+        self.layout_main.addLayout(self.layout_tenths)
+
+        self.layout_tenths_below = QHBoxLayout()
+        self.label_tenths_below = QLabel("0.1秒显示阈值(秒)")
+        self.layout_tenths_below.addWidget(self.label_tenths_below)
+        self.edit_tenths_below = LineEdit(self)
+        self.edit_tenths_below.setText(str(timer_info.m_iTenthsBelow))
+        self.edit_tenths_below.setPlaceholderText('剩余多少秒以内')
+        self.edit_tenths_below.setValidator(QIntValidator(1, 3600, self.edit_tenths_below))
+        self.edit_tenths_below.setClearButtonEnabled(True)
+        self.edit_tenths_below.editingFinished.connect(self.on_tenths_below_change)
+        self.layout_tenths_below.addWidget(self.edit_tenths_below)
+        self.layout_main.addLayout(self.layout_tenths_below)
+
         bIconTimer = timer_info.m_bIconTimer
         if bIconTimer:
             # 修改图标
@@ -357,8 +379,8 @@ class Timer_Menu(QWidget):
     def on_textoricon_change(self, bIconTimer):
         self.timer_info.m_bIconTimer = bIconTimer
         self.timer_info.OnEdit()
-        self.close_menu_func()
-        core_event.TriggerEvent("REOPEN_MENU")
+        # 只重建这个定时器的设置界面
+        core_event.TriggerEvent("REFRESH_MENU")
 
     def on_voice_change(self, bVoice):
         self.timer_info.m_bVoice = bVoice
@@ -369,19 +391,30 @@ class Timer_Menu(QWidget):
         if not sText:
             return
         self.timer_info.m_fTotalTime = int(sText)
-        self.timer_info.m_fTotalTimeMs = self.timer_info.m_fTotalTime * 1000
         self.timer_info.OnEdit()
         pass
 
+    def on_tenths_change(self, bTenths):
+        self.timer_info.m_bTenths = bTenths
+        self.timer_info.OnEdit()
+
+    def on_tenths_below_change(self):
+        sText = self.edit_tenths_below.text()
+        if not sText:
+            return
+        self.timer_info.m_iTenthsBelow = int(sText)
+        self.timer_info.OnEdit()
+
     def on_group_change(self):
         sText = self.edit_group.text()
         if not sText:
             return
+        iOldGroup = self.timer_info.m_groupId
         self.timer_info.m_groupId = int(sText)
         self.timer_info.OnEdit()
-        self.close_menu_func()
-        core_event.TriggerEvent("RELOAD_TIMER")
-        core_event.TriggerEvent("REOPEN_MENU")
+        # 只移动分组成员, 不重新加载所有定时器; 菜单只移动这个条目
+        core_event.TriggerEvent("TIMER_GROUP_CHANGE", self.timer_info.m_uuid, iOldGroup)
+        core_event.TriggerEvent("REFRESH_MENU")
         pass
 
     def on_font_size_change(self):
@@ -397,8 +430,7 @@ class Timer_Menu(QWidget):
             return
         self.timer_info.m_sName = sText
         self.timer_info.OnEdit()
-        self.close_menu_func()
-        core_event.TriggerEvent("REOPEN_MENU")
+        core_event.TriggerEvent("REFRESH_MENU")
         pass
 
     def on_cd_text_change(self):
@@ -469,9 +501,8 @@ class Timer_Menu(QWidget):
         print("准备删除：", self.timer_info.m_uuid)
         self.timer_info.ChangeSwitch(False)
         self.del_timer_func(self.timer_info.m_uuid)
-        # self.close()
-        self.close_menu_func()
-        core_event.TriggerEvent("REOPEN_MENU")
+        # 只移除这个定时器的条目, 主菜单保持打开
+        core_event.TriggerEvent("REFRESH_MENU")
         pass
 
     def on_record_keys(self, index):
@@ -489,22 +520,17 @@ class Timer_Menu(QWidget):
     def on_add_keys(self):
         print("新增热键")
         self.timer_info.m_lKeyCode.append([])
-        self.timer_info.Save()
-
-        bNeedClose = not self.timer_info.m_bOpen
-        self.timer_info.ChangeSwitch(True)
-        if bNeedClose:
-            self.timer_info.ChangeSwitch(False)
+        self.timer_info.OnEdit()
+        # 热键行数变化, 重建这个定时器的设置界面
+        core_event.TriggerEvent("REFRESH_MENU", [self.timer_info.m_uuid])
 
     def on_remove_key(self):
         print("删除热键")
+        if len(self.timer_info.m_lKeyCode) <= 1:
+            return
         self.timer_info.m_lKeyCode.pop()
         self.timer_info.OnEdit()
-
-        bNeedClose = not self.timer_info.m_bOpen
-        self.timer_info.ChangeSwitch(True)
-        if bNeedClose:
-            self.timer_info.ChangeSwitch(False)
+        core_event.TriggerEvent("REFRESH_MENU", [self.timer_info.m_uuid])
 
     def cache_keys(self, skey):
         self._cache_keys.append(skey)
@@ -514,6 +540,10 @@ class Timer_Menu(QWidget):
         index = self._record_key_index
         self._record_key_index = None
         self._cache_key_lister = None
+        if index is None or index >= len(self.timer_info.m_lKeyCode):
+            # 记录期间热键被删除或设置界面已重建
+            self._cache_keys = []
+            return
         self.timer_info.m_lKeyCode[index] = self._cache_keys
         self.timer_info.OnEdit()
         lineEdit = self._edit_key[index]
@@ -2,32 +2,97 @@
 # Author：一念断星河
 # Crete Data： 2025/5/18
 # Desc：不过是大梦一场空，不过是孤影照惊鸿。
+import weakref
+
 from core import core_save
-from core.core_define import Path_Group
+from core.core_define import Path_Group, Path_Timer
 
 
 class GroupProxy:
-    def __init__(self, uid, data):
+    def __init__(self, uid, data, bSaved=True):
         self.m_uuid = int(uid)  # 分组uid
-        self.m_sName = data.get('sName', "新建分组")
-        self.m_bOpen = data.get('bOpen', False)  # 是否开启
+        self.m_sName = data['sName']
+        self.m_bOpen = data['bOpen']  # 是否开启
         self.m_lTimer= []  # 当前组内定时器代理
+        self.m_SaveData = dict(data) if bSaved else {}  # 上次保存到存档的数据
 
-    def ChangeSwitch(self, bSwitch):
-        self.m_bOpen = bSwitch
+    def AddTimer(self, timer):
+        self.m_lTimer.append(weakref.proxy(timer))
+
+    def RemoveTimer(self, uid):
+        lTimer = []
+        for timer in self.m_lTimer:
+            try:
+                if timer.m_uuid == uid:
+                    continue
+            except ReferenceError:
+                continue
+            lTimer.append(timer)
+        self.m_lTimer = lTimer
+
+    def ApplyData(self, data):
+        # 存档被外部修改, 组内定时器的开关由定时器存档决定, 这里只更新分组本身
+        self.m_sName = data['sName']
+        self.m_bOpen = data['bOpen']
+        self.m_SaveData = dict(data)
+
+    def GetTimers(self):
+        # 组内还存在的定时器
+        lTimer = []
         for timer in self.m_lTimer:
-            timer.ChangeSwitch(bSwitch)
-        self.Save()
+            try:
+                timer.m_uuid
+            except ReferenceError:
+                continue
+            lTimer.append(timer)
+        self.m_lTimer = lTimer
+        return list(lTimer)
+
+    def ChangeSwitch(self, bSwitch):
+        # 批量开关, 组内所有定时器和分组的改动最后一起写入存档, 热键在下一帧统一生效
+        with core_save.Batch():
+            self.m_bOpen = bSwitch
+            for timer in self.GetTimers():
+                timer.ChangeSwitch(bSwitch)
+            self.Save()
+
+    def MoveTimers(self, iGroupId, oTarget=None):
+        """
+        组内定时器全部移动到另一个分组
+        :param oTarget: 目标分组, 分组不存在时为None
+        """
+        if iGroupId == self.m_uuid:
+            return
+        with core_save.Batch():
+            for timer in self.GetTimers():
+                timer.m_groupId = iGroupId
+                timer.Save()
+                if oTarget:
+                    oTarget.m_lTimer.append(timer)
+        self.m_lTimer = []
+
+    def Delete(self):
+        """
+        删除分组和组内定时器的存档, 悬浮窗由调用者关闭
+        :return: 组内定时器uid
+        """
+        lUid = [timer.m_uuid for timer in self.GetTimers()]
+        with core_save.Batch():
+            for uid in lUid:
+                core_save.DeleteKey(Path_Timer, uid)
+            core_save.DeleteKey(Path_Group, self.m_uuid)
+        self.m_lTimer = []
+        return lUid
 
     def Save(self):
         try:
-            data = core_save.LoadJson(Path_Group)
             self.m_uuid = int(self.m_uuid)
-            time_info = data.get(str(self.m_uuid), {})
-            time_info["sName"] = self.m_sName
-            time_info["bOpen"] = self.m_bOpen
-            data[str(self.m_uuid)] = time_info
-            core_save.SaveJson(Path_Group, data)
+            group_info = {"sName": self.m_sName, "bOpen": self.m_bOpen}
+            dChange = {k: v for k, v in group_info.items() if k not in self.m_SaveData or self.m_SaveData[k] != v}
+            if not dChange:
+                return
+            core_save.SaveField(Path_Group, self.m_uuid, dChange)
+            self.m_SaveData.update(dChange)
         except IOError as e:
             print(e)
             pass
@@ -2,53 +2,107 @@
 # Author：一念断星河
 # Crete Data：2024/6/3
 # Desc：不过是大梦一场空，不过是孤影照惊鸿。
+import contextlib
+import copy
 import weakref
 
 from core import core_save
-from core.core_define import Path_Timer, Path_Setting, SettingName
+from core.core_define import Path_Timer
+from logic.helper import config_schema
 from logic.timer.timer_label import Timer_Flyout
 
+class EEffect:
+	# 字段修改后需要刷新的部分
+	Non = 0
+	Render = 1  # 重绘
+	Asset = 2  # 图标、字体、尺寸
+	HotKey = 4  # 热键
+	Pos = 8  # 位置
+	Switch = 16  # 开关
+	Group = 32  # 分组
+	CountDown = 64  # 倒计时状态
+
+
+# 存档字段 -> (代理属性, 修改影响)
+TimerFields = (
+	("sName", "m_sName", EEffect.Non),
+	("sCDText", "m_sCD", EEffect.Asset),
+	("sPic", "m_sPic", EEffect.Asset),
+	("sMaskPic", "m_sMaskPic", EEffect.Asset),
+	("sReadyText", "m_sReady", EEffect.Asset),
+	("iTime", "m_fTotalTime", EEffect.CountDown),
+	("lKeyCode", "m_lKeyCode", EEffect.HotKey),
+	("bOpen", "m_bOpen", EEffect.Switch),
+	("bReset", "m_bReset", EEffect.Non),
+	("bTriggerInCd", "m_bTriggerInCd", EEffect.Non),
+	("bCycle", "m_bCycle", EEffect.CountDown),
+	("bVoice", "m_bVoice", EEffect.Non),
+	("bIconTimer", "m_bIconTimer", EEffect.Asset),
+	("iFontSize", "m_iFontSize", EEffect.Asset),
+	("iBoardSize", "m_iBoardSize", EEffect.Render),
+	("iConSize", "m_iConSize", EEffect.Asset),
+	("cdColor", "m_cdColor", EEffect.Render),
+	("readyColor", "m_readyColor", EEffect.Render),
+	("bgColor", "m_bgColor", EEffect.Render),
+	("boardColor", "m_boardColor", EEffect.Render),
+	("groupId", "m_groupId", EEffect.Group),
+	("force_match", "m_forceMatch", EEffect.HotKey),
+	("tPos", "m_tPos", EEffect.Pos),
+	("bTenths", "m_bTenths", EEffect.Asset),
+	("iTenthsBelow", "m_iTenthsBelow", EEffect.Asset),
+)
+
+
+def GetEffect(dChange):
+	# 改动的字段 -> 需要刷新的部分
+	iEffect = EEffect.Non
+	for sKey, _, iFieldEffect in TimerFields:
+		if sKey in dChange:
+			iEffect |= iFieldEffect
+	return iEffect
+
 
 class TimerProxy:
-	def __init__(self, uid, data):
+	def __init__(self, uid, data, lazy=False, bSaved=True):
+		"""
+		:param data: 存档数据
+		:param lazy: data只是摘要, 其他字段用到时再读取
+		:param bSaved: data是否已在存档中, 新建的定时器为False, 第一次保存时写入全部字段
+		"""
 		self.m_uuid = int(uid)
-		self.m_sName = data.get('sName', "新建定时器")
-		self.m_sCD = data.get('sCDText', '冷却中')
-		self.m_sPic = data.get('sPic', "")
-		self.m_sMaskPic = data.get('sMaskPic', "")
-		self.m_sReady = data.get('sReadyText', '已就绪')
-		self.m_fTotalTime = int(data.get('iTime', 3))
-		self.m_fTotalTimeMs = self.m_fTotalTime * 1000
-		self.m_iFontSize = int(data.get('iFontSize', 18))
-		self.m_iConSize = int(data.get('iConSize', 50))
-		self.m_iBoardSize = int(data.get('iBoardSize', 0))
-		self.m_lKeyCode = data.get('lKeyCode', [])
-		self.m_bOpen = data.get('bOpen', False)  # 是否开启
-		self.m_bReset = data.get('bReset', False)  # 允许被重置
-		self.m_bTriggerInCd = data.get('bTriggerInCd', True)  # 允许冷却时触发
-		self.m_bCycle = data.get('bCycle', False)  # 循环触发
-		self.m_bVoice = data.get('bVoice', True)  # 语音播报
-		self.m_bIconTimer = data.get('bIconTimer', True)  # 文本|图标定时器
-		self.m_tPos = tuple(data.get('tPos', (0, 0)))
-		self.m_tPos = int(self.m_tPos[0]), int(self.m_tPos[1])
-		self.m_cdColor = data.get('cdColor', "#FF0000")
-		self.m_readyColor = data.get('readyColor', "#00FFFF")
-		self.m_bgColor = data.get('bgColor', "#00000000")
-		self.m_boardColor = data.get('boardColor', "#000000")
-		self.m_groupId = data.get('groupId', 0)
-		self.m_forceMatch = data.get('force_match', False)
 		self.m_FlyView: "Timer_Flyout" = None
-
-		# 存档兼容
-		if not self.m_lKeyCode:
-			self.m_lKeyCode = [[]]
-			self.Save()
-		if self.m_lKeyCode and type(self.m_lKeyCode[0]) == str:
-			self.m_lKeyCode = [self.m_lKeyCode]
-			self.Save()
+		self.m_bLoaded = not lazy
+		self.m_iEditDepth = 0  # 编辑中, 结束时统一提交
+		if lazy:
+			# 关闭的定时器只读取了摘要, 其他字段第一次访问时再从存档读取
+			self.m_sName = data.get('sName', "新建定时器")
+			self.m_groupId = data.get('groupId', 0)
+			self.m_bOpen = False
+			return
+		self._InitData(data, bSaved)
 
 		if self.m_bOpen:
 			self._CreateFlyView()
+
+	def __getattr__(self, name):
+		# 懒加载: 访问尚未读取的字段时才读取完整数据
+		if not name.startswith("m_") or self.__dict__.get("m_bLoaded", True):
+			raise AttributeError(name)
+		self.m_bLoaded = True
+		dSummary = {k: self.__dict__[k] for k in ("m_sName", "m_groupId", "m_bOpen")}
+		self._InitData(config_schema.LoadItem(Path_Timer, self.m_uuid))
+		# 摘要字段可能已经在菜单里被改过了, 以内存中的为准
+		self.__dict__.update(dSummary)
+		return getattr(self, name)
+
+	def _InitData(self, data, bSaved=True):
+		# 存档已经过迁移和校验(config_schema), 这里直接读取, 不再做兼容修正
+		self.m_SaveData = copy.deepcopy(data) if bSaved else {}  # 上次保存到存档的数据, 保存时只写改动的字段
+		for sKey, sAttr, _ in TimerFields:
+			setattr(self, sAttr, data[sKey])
+		self.m_lKeyCode = copy.deepcopy(self.m_lKeyCode)
+		self.m_tPos = tuple(self.m_tPos)
+		self.m_fTotalTimeMs = self.m_fTotalTime * 1000
 	
 	def Reset(self):
 		# 不允许重置
@@ -56,66 +110,161 @@ class TimerProxy:
 			return
 		if not self.m_bOpen:
 			return
-		self.m_FlyView.OnRefresh()
+		self.m_FlyView.ResetCountDown()
 
 	def OnEdit(self):
-		self.Save()
-		if not self.m_bOpen:
+		# 字段已修改, 编辑中时等编辑结束再统一提交
+		if self.m_iEditDepth:
 			return
-		self.m_FlyView.OnRefresh()
-	
+		self._Commit()
+
+	def BeginEdit(self):
+		self.m_iEditDepth += 1
+
+	def EndEdit(self):
+		"""
+		结束编辑, 最外层结束时提交所有改动
+		:return: 改动的影响 EEffect
+		"""
+		self.m_iEditDepth -= 1
+		if self.m_iEditDepth > 0:
+			return EEffect.Non
+		return self._Commit()
+
+	@contextlib.contextmanager
+	def Edit(self):
+		"""
+		编辑: 期间修改的字段在结束时只保存一次、只刷新受影响的部分
+		with timer.Edit():
+			timer.m_iFontSize = 20
+			timer.m_cdColor = "#FF0000"
+		"""
+		self.BeginEdit()
+		try:
+			yield self
+		finally:
+			self.EndEdit()
+
+	def SetData(self, data):
+		# 按存档字段批量修改, 导入和脚本修改用
+		with self.Edit():
+			for sKey, sAttr, _ in TimerFields:
+				if sKey in data:
+					setattr(self, sAttr, copy.deepcopy(data[sKey]))
+
+	def _Commit(self):
+		# 与上次保存比较, 改动的字段写入存档并刷新受影响的部分
+		dChange = self.GetChangedData()
+		if not dChange:
+			return EEffect.Non
+		iEffect = GetEffect(dChange)
+		self.m_tPos = tuple(self.m_tPos)
+		self.m_fTotalTimeMs = self.m_fTotalTime * 1000
+		self.Save()
+		if iEffect & EEffect.Switch:
+			# 开关变化时悬浮窗整体创建/关闭, 不需要再单独刷新
+			self._UpdateFlyView()
+			return iEffect
+		self._Refresh(iEffect)
+		return iEffect
+
 	def ChangeSwitch(self, bSwitch):
 		if self.m_bOpen == bSwitch:
 			return
-		if not bSwitch:
-			if self.m_FlyView:
-				self.m_FlyView.close()
-				self.m_FlyView = None
-			self.m_bOpen = False
-			self.Save()
-		else:
+		with self.Edit():
+			self.m_bOpen = bSwitch
+
+	def Destroy(self):
+		# 定时器被删除, 关闭悬浮窗, 不写存档
+		if self.m_FlyView:
+			self.m_FlyView.close()
+			self.m_FlyView = None
+
+	def ApplyData(self, data):
+		"""
+		存档被外部修改后, 用新数据更新定时器, 只刷新受影响的部分
+		:param data: 校验过的存档数据
+		:return: 改动的影响 EEffect
+		"""
+		iEffect = EEffect.Non
+		dCur = self.ToData()
+		for sKey, sAttr, iFieldEffect in TimerFields:
+			if dCur[sKey] == data[sKey] or sKey == "bOpen":
+				continue
+			setattr(self, sAttr, copy.deepcopy(data[sKey]))
+			iEffect |= iFieldEffect
+		self.m_tPos = tuple(self.m_tPos)
+		self.m_fTotalTimeMs = self.m_fTotalTime * 1000
+		self.m_SaveData = copy.deepcopy(data)
+
+		if self.m_bOpen != data["bOpen"]:
+			# 开关变化时悬浮窗整体创建/关闭, 不需要再单独刷新
+			self.m_bOpen = data["bOpen"]
+			self._UpdateFlyView()
+			return iEffect | EEffect.Switch
+		self._Refresh(iEffect)
+		return iEffect
+
+	def _Refresh(self, iEffect):
+		# 按修改影响刷新悬浮窗
+		if not self.m_FlyView:
+			return
+		if iEffect & EEffect.Asset:
+			self.m_FlyView.ReloadAssets()
+		if iEffect & EEffect.HotKey:
+			self.m_FlyView.RebindHotKeys()
+		if iEffect & EEffect.CountDown:
+			self.m_FlyView.ResetCountDown()
+		if iEffect & EEffect.Pos:
+			self.m_FlyView.move(*self.m_tPos)
+		if iEffect & EEffect.Render:
+			self.m_FlyView.update()
+
+	def _UpdateFlyView(self):
+		# 按开关创建/关闭悬浮窗
+		if self.m_bOpen:
+			if not self.m_FlyView:
+				self._CreateFlyView()
+		elif self.m_FlyView:
+			self.m_FlyView.close()
+			self.m_FlyView = None
+
+	def RecreateFlyView(self):
+		# 显示模式切换后重新创建悬浮窗
+		if self.m_FlyView:
 			self._CreateFlyView()
-			self.m_bOpen = True
-			self.Save()
-		pass
-	
+
 	def _CreateFlyView(self):
 		if self.m_FlyView:
 			self.m_FlyView.close()
 		self.m_FlyView = Timer_Flyout(weakref.proxy(self))
 		self.m_FlyView.show()
 	
+	def ToData(self):
+		# 当前数据 -> 存档格式
+		time_info = {}
+		for sKey, sAttr, _ in TimerFields:
+			time_info[sKey] = getattr(self, sAttr)
+		time_info["tPos"] = [int(self.m_tPos[0]), int(self.m_tPos[1])]
+		return time_info
+
+	def GetChangedData(self):
+		# 与上次保存相比改动过的字段
+		dChange = {}
+		for sKey, value in self.ToData().items():
+			if sKey not in self.m_SaveData or self.m_SaveData[sKey] != value:
+				dChange[sKey] = value
+		return dChange
+
 	def Save(self):
 		try:
-			data = core_save.LoadJson(Path_Timer)
 			self.m_uuid = int(self.m_uuid)
-			time_info = data.get(str(self.m_uuid), {})
-			time_info["sName"] = self.m_sName
-			time_info["sCDText"] = self.m_sCD
-			time_info["sPic"] = self.m_sPic
-			time_info["sMaskPic"] = self.m_sMaskPic
-			time_info["sReadyText"] = self.m_sReady
-			time_info["iTime"] = self.m_fTotalTime
-			time_info["lKeyCode"] = self.m_lKeyCode
-			time_info["bOpen"] = self.m_bOpen
-			time_info["bReset"] = self.m_bReset
-			time_info["bTriggerInCd"] = self.m_bTriggerInCd
-			time_info["bCycle"] = self.m_bCycle
-			time_info["bVoice"] = self.m_bVoice
-			time_info["bIconTimer"] = self.m_bIconTimer
-			time_info["iFontSize"] = self.m_iFontSize
-			time_info["iBoardSize"] = self.m_iBoardSize
-			time_info["iConSize"] = self.m_iConSize
-			time_info["cdColor"] = self.m_cdColor
-			time_info["readyColor"] = self.m_readyColor
-			time_info["bgColor"] = self.m_bgColor
-			time_info["boardColor"] = self.m_boardColor
-			time_info["groupId"] = self.m_groupId
-			time_info["force_match"] = self.m_forceMatch
-			time_info["tPos"] = [int(self.m_tPos[0]), int(self.m_tPos[1])]
-			
-			data[str(self.m_uuid)] = time_info
-			core_save.SaveJson(Path_Timer, data)
+			dChange = self.GetChangedData()
+			if not dChange:
+				return
+			core_save.SaveField(Path_Timer, self.m_uuid, dChange)
+			# 热键列表等会被原地修改, 需要深拷贝
+			self.m_SaveData.update(copy.deepcopy(dChange))
 		except IOError as e:
 			print(e)
 			pass
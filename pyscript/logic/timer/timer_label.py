@@ -9,9 +9,11 @@ from PySide6.QtCore import *
 from PySide6.QtGui import *
 from PySide6.QtWidgets import *
 
-from core import core_input, core_timer
+from core import core_input, core_cooldown, core_setting, core_render, core_idle
 from core import core_voice
-from core.core_define import Path_IconRoot
+from core.core_define import Path_IconRoot, SettingName
+from logic.helper import icon_cache
+from logic.timer import timer_overlay, timer_render
 
 if TYPE_CHECKING:
     from logic.timer.timer_info import TimerProxy
@@ -28,6 +30,16 @@ class Timer_Flyout(QLabel):
         self.timerInfoProxy = timeProxy
         self.m_Timer = None
         self.m_Listens = []
+        # 合成模式下自身不显示, 由 timer_overlay 的窗口统一绘制
+        self.m_bOverlay = core_setting.Get(SettingName.OverlayMode)
+        self.m_OverlayRect = None  # 上次通知合成窗口的区域, None为还没加入
+        self.pos_first = None
+        self.m_LayerCache = timer_render.LayerCache()
+        self.m_iSweepStep = -1  # 冷却扫描上次刷新的帧号
+        self.m_sWidest = ""
+        self.m_WidestKey = None
+        self.m_sText = ""  # 显示的文字, 自己绘制, 不经过 QLabel.setText
+        self.m_PendingSize = None  # 等渲染节拍应用的尺寸
 
         self._Pixmap = None
         self._MaskPixmap = None
@@ -37,11 +49,19 @@ class Timer_Flyout(QLabel):
 
     def OnRefresh(self):
         """
-        刷新数据
+        全部刷新, 只在创建时调用; 修改数据时按影响分别调用下面几个刷新
+        """
+        self.ReloadAssets()
+        self.RebindHotKeys()
+        self.ResetCountDown()
+        self.move(*self.timerInfoProxy.m_tPos)
+
+    def ReloadAssets(self):
+        """
+        重新加载图标、字号并适配尺寸
         """
         self._Pixmap = None
         self._MaskPixmap = None
-        self.setText("")
 
         timeProxy = self.timerInfoProxy
 
@@ -49,47 +69,51 @@ class Timer_Flyout(QLabel):
         bIconTimer = timeProxy.m_bIconTimer
 
         if bIconTimer:
+            # 按屏幕的设备像素比缩放, 多个定时器共用同一份缓存
+            dpr = self.devicePixelRatioF()
             if self.timerInfoProxy.m_sPic:
                 icon_path = os.path.join(Path_IconRoot, self.timerInfoProxy.m_sPic)
-                if os.path.exists(icon_path):
-                    self._Pixmap = QPixmap()
-                    self._Pixmap.load(str(icon_path))
-                    self._Pixmap = self._Pixmap.scaled(QSize(self.timerInfoProxy.m_iConSize, self.timerInfoProxy.m_iConSize))
+                self._Pixmap = icon_cache.GetPixmap(icon_path, self.timerInfoProxy.m_iConSize, dpr)
 
             if self.timerInfoProxy.m_sMaskPic:
                 icon_path = os.path.join(Path_IconRoot, self.timerInfoProxy.m_sMaskPic)
-                if os.path.exists(icon_path):
-                    self._MaskPixmap = QPixmap()
-                    self._MaskPixmap.load(str(icon_path))
-                    self._MaskPixmap = self._MaskPixmap.scaled(QSize(self.timerInfoProxy.m_iConSize, self.timerInfoProxy.m_iConSize))
-            self.resize(self.timerInfoProxy.m_iConSize, self.timerInfoProxy.m_iConSize)
+                self._MaskPixmap = icon_cache.GetPixmap(icon_path, self.timerInfoProxy.m_iConSize, dpr)
+        if not self.m_Timer:
+            # 冷却中的文本由倒计时刷新
+            self.setText("" if bIconTimer else timeProxy.m_sReady)
         else:
-            # 文本
-            self.setText(timeProxy.m_sReady)
+            core_cooldown.Wake(timeProxy.m_uuid)
 
-        # 字号
-        self._font = QFont()
-        self._font.setPointSize(self.timerInfoProxy.m_iFontSize)
-        self.setFont(self._font)
+        # 字号, 没变时不用重新创建字体
+        if not self._font or self._font.pointSize() != self.timerInfoProxy.m_iFontSize:
+            self._font = QFont()
+            self._font.setPointSize(self.timerInfoProxy.m_iFontSize)
+            self.setFont(self._font)
 
-        # 倒计时
-        self.m_fCurTimeMs = timeProxy.m_fTotalTimeMs
-        # 热键
+        # 适配
+        self.adjustSize()
+        self.update()
+
+    def RebindHotKeys(self):
+        """
+        重新注册热键
+        """
         self.m_Listens.clear()
-        for keycode in timeProxy.m_lKeyCode:
+        for keycode in self.timerInfoProxy.m_lKeyCode:
             if not keycode:
                 continue
             proxy = core_input.RegisterHotKey(keycode, self.RefreshCountDown, force_match=self.timerInfoProxy.m_forceMatch)
             self.m_Listens.append(proxy)
-        # 定时器
-        self.m_Timer = None
 
-        # 适配
+    def ResetCountDown(self):
+        """
+        结束倒计时回到就绪状态, 只切换状态, 不重新加载图标和热键
+        """
+        self.m_Timer = None
+        self.m_fCurTimeMs = self.timerInfoProxy.m_fTotalTimeMs
+        self.setText("" if self.timerInfoProxy.m_bIconTimer else self.timerInfoProxy.m_sReady)
         self.adjustSize()
-
-        self.move(*timeProxy.m_tPos)
         self.update()
-        pass
 
     def RefreshCountDown(self):
         """
@@ -97,7 +121,7 @@ class Timer_Flyout(QLabel):
         """
         if self.m_Timer is not None:
             if self.timerInfoProxy.m_bCycle:
-                self.OnRefresh()
+                self.ResetCountDown()
                 if self.timerInfoProxy.m_bVoice:
                     core_voice.Speak(f"{self.timerInfoProxy.m_sReady}")
                 return
@@ -108,46 +132,199 @@ class Timer_Flyout(QLabel):
         # 刷新当前时间
         self.m_fCurTimeMs = timeProxy.m_fTotalTimeMs
 
-        # 开启倒计时
-        self.m_Timer = core_timer.CreateAlwaysTimer(1, self.OnCountDown, delta=True)
+        # 开启倒计时, 循环倒计时结束后自动重新开始
+        self.m_Timer = core_cooldown.StartCooldown(timeProxy.m_uuid, self.m_fCurTimeMs, self.OnCountDown,
+                                                   self.OnCountDownEnd, timeProxy.m_bCycle)
         cycleText = "循环" if self.timerInfoProxy.m_bCycle else ""
         if self.timerInfoProxy.m_bVoice:
             core_voice.Speak(f"{timeProxy.m_sName}开始{cycleText}计时！")
 
-    def OnCountDown(self, deltaMs):
+    def OnCountDown(self, fRemainMs):
         """
         倒计时持续中
+        :return: 剩余时间低于多少毫秒时显示会变化, 在此之前不需要再回调
         """
-        self.m_fCurTimeMs -= deltaMs
-        if self.m_fCurTimeMs <= 0:
-            if not self.timerInfoProxy.m_bCycle:
-                self.OnRefresh()
-                if self.timerInfoProxy.m_bVoice:
-                    core_voice.Speak(f"{self.timerInfoProxy.m_sReady}")
-                return
-            else:
-                self.m_fCurTimeMs += self.timerInfoProxy.m_fTotalTimeMs
+        self.m_fCurTimeMs = fRemainMs
+        sText = self.FormatCountDown(fRemainMs)
+        fNextMs = self._GetNextChangeMs(fRemainMs)
+        # 冷却扫描按设置的帧率刷新, 帧号按全局时间计算, 所有定时器在同一帧一起重绘
+        # 空闲或看不到时暂停扫描动画, 只随文字变化重绘
+        bSweep = False
+        iFps = core_setting.Get(SettingName.SweepFps)
+        if iFps > 0 and self.timerInfoProxy.m_bIconTimer and not core_idle.IsSuspend():
+            fNextMs = max(fNextMs, fRemainMs - 1000 / iFps)
+            iStep = int(core_cooldown.GetTimeMs() * iFps / 1000)
+            if iStep != self.m_iSweepStep:
+                self.m_iSweepStep = iStep
+                bSweep = True
+        # 显示的内容没变时什么都不做, 不会触发重绘
+        if sText == self.text():
+            if bSweep:
+                self.update()
+            return fNextMs
+        self.setText(sText)
+        self.adjustSize()
+        self.update()
+        return fNextMs
+
+    def _IsTenths(self, fRemainMs):
+        proxy = self.timerInfoProxy
+        return proxy.m_bTenths and fRemainMs < proxy.m_iTenthsBelow * 1000
+
+    def _GetNextChangeMs(self, fRemainMs):
+        # 秒显示每秒变化一次, 十分之一秒显示每100毫秒变化一次
+        if self._IsTenths(fRemainMs):
+            return int(fRemainMs / 100) * 100
+        fNextMs = int(fRemainMs / 1000) * 1000
+        if self.timerInfoProxy.m_bTenths:
+            fNextMs = max(fNextMs, self.timerInfoProxy.m_iTenthsBelow * 1000)
+        return fNextMs
+
+    def FormatCountDown(self, fRemainMs):
         bIconTimer = self.timerInfoProxy.m_bIconTimer
         sInfo = self.timerInfoProxy.m_sCD+" " if not bIconTimer else ""
         sInfoUnit = " s" if not bIconTimer else ""
-        self.setText(f"{sInfo}{int(self.m_fCurTimeMs / 1000)}{sInfoUnit}")
-        self.adjustSize()
-        pass
+        if self._IsTenths(fRemainMs):
+            return f"{sInfo}{int(fRemainMs / 100) / 10:.1f}{sInfoUnit}"
+        return f"{sInfo}{int(fRemainMs / 1000)}{sInfoUnit}"
+
+    def _GetWidestText(self, fontMetrics, sWidestDigit):
+        # 倒计时期间最宽的文本, 每个数字都换成最宽的数字; 尺寸按它计算, 倒计时中不再改变大小
+        proxy = self.timerInfoProxy
+        lText = [self.FormatCountDown(proxy.m_fTotalTimeMs)]
+        if proxy.m_bTenths:
+            lText.append(self.FormatCountDown(min(proxy.m_fTotalTimeMs, proxy.m_iTenthsBelow * 1000) - 1))
+        key = (tuple(lText), sWidestDigit)
+        if self.m_WidestKey != key:
+            self.m_WidestKey = key
+            lText = ["".join(sWidestDigit if ch.isdigit() else ch for ch in sText) for sText in lText]
+            self.m_sWidest = max(lText, key=fontMetrics.horizontalAdvance)
+        return self.m_sWidest
+
+    def OnCountDownEnd(self):
+        """
+        倒计时结束
+        """
+        self.ResetCountDown()
+        if self.timerInfoProxy.m_bVoice:
+            core_voice.Speak(f"{self.timerInfoProxy.m_sReady}")
 
     def adjustSize(self):
         if self.timerInfoProxy.m_bIconTimer:
             w, h = self.timerInfoProxy.m_iConSize, self.timerInfoProxy.m_iConSize
         else:
-            fontMetrics = QFontMetrics(self.font())
-            textWidth = fontMetrics.horizontalAdvance(self.text())
+            fontMetrics, sWidestDigit = timer_render.GetMetrics(self.font())
+            sText = self._GetWidestText(fontMetrics, sWidestDigit) if self.m_Timer else self.text()
+            textWidth = fontMetrics.horizontalAdvance(sText)
             textHeight = fontMetrics.height()
             w, h = textWidth + 10, textHeight + 10
-        # 考虑到内边距和边框等因素，可能需要添加一些额外的空间  
-        self.setFixedSize(w, h)
+        # 考虑到内边距和边框等因素，可能需要添加一些额外的空间
+        # 尺寸在渲染节拍里应用, setFixedSize 会在 C++ 里直接触发重绘
+        size = QSize(w, h)
+        if size == (self.m_PendingSize if self.m_PendingSize is not None else self.size()):
+            return
+        self.m_PendingSize = size
+        self.update()
+
+    def setText(self, sText):
+        # 只记录文字并标记重绘, QLabel.setText 会在逻辑更新里直接重绘
+        if sText == self.m_sText:
+            return
+        self.m_sText = sText
+        self.update()
+
+    def text(self):
+        return self.m_sText
+
+    # region 合成模式
+    def show(self):
+        if not self.m_bOverlay:
+            return super().show()
+        # 加入前先应用等待中的尺寸, 否则合成窗口会按默认的 640x480 计算区域和点击范围
+        self._ApplyPendingSize()
+        self.m_OverlayRect = self.geometry()
+        timer_overlay.Add(self)
+
+    def close(self):
+        if self.m_bOverlay and self.m_OverlayRect is not None:
+            self.m_OverlayRect = None
+            timer_overlay.Remove(self)
+        return super().close()
+
+    def update(self, *args):
+        # 逻辑更新里只做标记, 由渲染节拍统一重绘
+        core_render.MarkDirty(id(self), self._Repaint)
+
+    def _ApplyPendingSize(self):
+        if self.m_PendingSize is None:
+            return
+        size, self.m_PendingSize = self.m_PendingSize, None
+        if size != self.size():
+            self.setFixedSize(size)
+            self._UpdateOverlay()
+
+    def _Repaint(self):
+        self._ApplyPendingSize()
+        if not self.m_bOverlay:
+            return super().update()
+        if self.m_OverlayRect is not None:
+            timer_overlay.Invalidate(self.geometry())
+
+    def move(self, *args):
+        super().move(*args)
+        self._UpdateOverlay()
+
+    def _UpdateOverlay(self):
+        # 合成模式下移动和尺寸变化不会触发重绘, 需要通知合成窗口
+        if not self.m_bOverlay or self.m_OverlayRect is None:
+            return
+        rect = self.geometry()
+        if rect == self.m_OverlayRect:
+            return
+        timer_overlay.OnGeometryChange(self.m_OverlayRect, rect)
+        self.m_OverlayRect = rect
+    # endregion
 
     def paintEvent(self, event):
         painter = QPainter(self)
-        _rect = self.rect()
+        self.Paint(painter, self.rect())
+
+    def Paint(self, painter, _rect):
+        """
+        在 _rect 区域绘制定时器, 悬浮窗和合成窗口共用
+        静态部分贴缓存的图层, 文字从字形图集贴图
+        """
+        proxy = self.timerInfoProxy
+        dpr = painter.device().devicePixelRatioF()
+        sColor = proxy.m_cdColor if self.m_Timer else proxy.m_readyColor
+        atlas = timer_render.GetAtlas(self.font(), sColor, dpr)
+
+        # --------------------- 文本定时器 ---------------------
+        if not proxy.m_bIconTimer:
+            painter.fillRect(_rect, timer_render.GetBrush(proxy.m_bgColor))
+            atlas.Draw(painter, _rect, self.text())
+            return
+
+        # --------------------- 图标定时器 ---------------------
+        fTotalMs = proxy.m_fTotalTimeMs
+        if self.m_Timer and fTotalMs > 0 and core_setting.Get(SettingName.SweepFps) > 0:
+            # 冷却扫描: 就绪图层上叠一块扇形的冷却图层
+            painter.drawPixmap(_rect.topLeft(), self.m_LayerCache.GetLayer(self, False, dpr))
+            painter.save()
+            painter.translate(_rect.topLeft())
+            painter.setClipPath(timer_render.GetSweepPath(_rect.width(), _rect.height(), self.m_fCurTimeMs / fTotalMs),
+                                Qt.IntersectClip)
+            painter.drawPixmap(0, 0, self.m_LayerCache.GetLayer(self, True, dpr))
+            painter.restore()
+        else:
+            painter.drawPixmap(_rect.topLeft(), self.m_LayerCache.GetLayer(self, bool(self.m_Timer), dpr))
+        iBoard = proxy.m_iBoardSize
+        atlas.Draw(painter, _rect.adjusted(iBoard - 1, iBoard - 1, 1 - iBoard, 1 - iBoard), self.text())
+
+    def PaintLayer(self, painter, _rect, bCooling):
+        """
+        绘制图标定时器的静态图层: 背景、图标或遮罩、边框, 结果由 timer_render 缓存
+        """
         x = _rect.x() - 1
         y = _rect.y() - 1
         w = _rect.width() + 2
@@ -157,26 +334,12 @@ class Timer_Flyout(QLabel):
         iBoard = self.timerInfoProxy.m_iBoardSize
         content_rect = QRect(x + iBoard, y + iBoard, w - 2 * iBoard, h - 2 * iBoard)
 
-        # --------------------- 文本定时器 ---------------------
-        if not self.timerInfoProxy.m_bIconTimer:
-            painter.setBrush(QBrush(QColor(self.timerInfoProxy.m_bgColor)))
-            painter.drawRect(ori_rect)
-
-            if self.m_Timer:
-                painter.setPen(QPen(QColor(self.timerInfoProxy.m_cdColor), 2))
-            else:
-                painter.setPen(QPen(QColor(self.timerInfoProxy.m_readyColor), 2))
-            painter.drawText(ori_rect, Qt.AlignCenter, self.text())
-            return
-
-        # --------------------- 图标定时器 ---------------------
-        # 绘制背景颜色f
-        painter.setBrush(QBrush(QColor(self.timerInfoProxy.m_bgColor)))
+        # 绘制背景颜色
+        painter.setBrush(timer_render.GetBrush(self.timerInfoProxy.m_bgColor))
         painter.drawRect(ori_rect)
 
-        # 图标和遮罩的选择f
-        if not self.m_Timer:
-            # 如果没有定时器
+        # 图标和遮罩的选择
+        if not bCooling:
             if self._Pixmap:
                 painter.drawPixmap(content_rect, self._Pixmap)
         else:
@@ -184,12 +347,12 @@ class Timer_Flyout(QLabel):
                 painter.drawPixmap(content_rect, self._MaskPixmap)
             elif self._Pixmap:
                 painter.drawPixmap(content_rect, self._Pixmap)
-                painter.setBrush(QBrush(QColor("#66000000")))
+                painter.setBrush(timer_render.GetBrush("#66000000"))
                 painter.drawRect(ori_rect)
 
         if iBoard > 0:
             # 绘制边框
-            painter.setBrush(QBrush(QColor(self.timerInfoProxy.m_boardColor)))
+            painter.setBrush(timer_render.GetBrush(self.timerInfoProxy.m_boardColor))
             x += 0.5
             y += 0.5
             w -= 2
@@ -203,20 +366,13 @@ class Timer_Flyout(QLabel):
             painter.drawRect(left_rect)
             painter.drawRect(right_rect)
 
-        # 冷却文本的选择
-        if self.m_Timer:
-            painter.setPen(QPen(QColor(self.timerInfoProxy.m_cdColor), 2))
-        else:
-            painter.setPen(QPen(QColor(self.timerInfoProxy.m_readyColor), 2))
-        painter.drawText(content_rect, Qt.AlignCenter, self.text())
-
     def IsColorValid(self, color):
         return not str(color).startswith("#00")
 
     def mousePressEvent(self, QMouseEvent):
         self.pos_first = None
         if QMouseEvent.button() == Qt.LeftButton:
-            self.pos_first = QMouseEvent.globalPos() - self.pos()
+            self.BeginDrag(QMouseEvent.globalPos())
             QMouseEvent.accept()
             self.setCursor(QCursor(Qt.OpenHandCursor))
             return
@@ -225,14 +381,24 @@ class Timer_Flyout(QLabel):
         if not self.pos_first:
             return
         if Qt.LeftButton:
-            self.move(QMouseEvent.globalPos() - self.pos_first)
-            # self.x, self.y = self.pos().x, self.pos().y
-            # self.timerInfoProxy.m_tPos = self.xy()
+            self.DragTo(QMouseEvent.globalPos())
             QMouseEvent.accept()
 
     def mouseReleaseEvent(self, QMouseEvent):
         if QMouseEvent.button() != Qt.LeftButton:
             return
+        self.EndDrag()
+
+    def BeginDrag(self, globalPos):
+        self.pos_first = globalPos - self.pos()
+
+    def DragTo(self, globalPos):
+        if not self.pos_first:
+            return
+        self.move(globalPos - self.pos_first)
+
+    def EndDrag(self):
+        self.pos_first = None
         if self.xy() != self.timerInfoProxy.m_tPos:
             pos = self.xy()
             self.timerInfoProxy.m_tPos = int(pos[0]), int(pos[1])
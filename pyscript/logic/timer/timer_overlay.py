@@ -0,0 +1,158 @@
+# --*utf-8*--
+# Author：一念断星河
+# Crete Data：2026/10/19
+# Desc：不过是大梦一场空，不过是孤影照惊鸿。
+# 合成模式: 每个屏幕一个全屏透明窗口, 所有定时器在同一个 paintEvent 里绘制
+# 窗口只在定时器所在的区域接收鼠标(setMask), 其他区域点击会穿透到游戏
+from typing import TYPE_CHECKING, List
+
+from PySide6.QtCore import *
+from PySide6.QtGui import *
+from PySide6.QtWidgets import *
+
+if TYPE_CHECKING:
+    from logic.timer.timer_label import Timer_Flyout
+
+
+class Timer_Overlay(QWidget):
+    def __init__(self, screen: QScreen):
+        super().__init__(None)
+        self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool | Qt.WindowDoesNotAcceptFocus)
+        self.setAttribute(Qt.WA_TranslucentBackground, True)
+        self.setAttribute(Qt.WA_ShowWithoutActivating, True)
+        self.m_Screen = screen
+        self.m_DragFlyout = None
+        self.setGeometry(screen.geometry())
+
+    def Origin(self):
+        return self.geometry().topLeft()
+
+    def UpdateRect(self, rect: QRect):
+        # 全局坐标的脏矩形
+        rect = rect.intersected(self.geometry())
+        if rect.isEmpty():
+            return
+        self.update(rect.translated(-self.Origin()))
+
+    def UpdateMask(self):
+        # 只有定时器所在的区域接收鼠标
+        region = QRegion()
+        origin = self.Origin()
+        for flyout in g_Instance.m_lFlyout:
+            rect = flyout.geometry().intersected(self.geometry())
+            if not rect.isEmpty():
+                region = region.united(rect.translated(-origin))
+        if region.isEmpty():
+            # 空的遮罩等于不设置遮罩, 没有定时器时直接隐藏
+            self.hide()
+            return
+        self.setMask(region)
+        if not self.isVisible():
+            self.show()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        origin = self.Origin()
+        dirty = event.rect()
+        for flyout in g_Instance.m_lFlyout:
+            rect = flyout.geometry().translated(-origin)
+            if not rect.intersects(dirty):
+                continue
+            painter.save()
+            flyout.Paint(painter, rect)
+            painter.restore()
+
+    def HitTest(self, globalPos: QPoint):
+        # 后添加的画在上面, 优先命中
+        for flyout in reversed(g_Instance.m_lFlyout):
+            if flyout.geometry().contains(globalPos):
+                return flyout
+        return None
+
+    def mousePressEvent(self, QMouseEvent):
+        self.m_DragFlyout = None
+        if QMouseEvent.button() != Qt.LeftButton:
+            return
+        flyout = self.HitTest(QMouseEvent.globalPos())
+        if not flyout:
+            return
+        self.m_DragFlyout = flyout
+        flyout.BeginDrag(QMouseEvent.globalPos())
+        self.setCursor(QCursor(Qt.OpenHandCursor))
+        QMouseEvent.accept()
+
+    def mouseMoveEvent(self, QMouseEvent):
+        if not self.m_DragFlyout:
+            return
+        self.m_DragFlyout.DragTo(QMouseEvent.globalPos())
+        QMouseEvent.accept()
+
+    def mouseReleaseEvent(self, QMouseEvent):
+        if QMouseEvent.button() != Qt.LeftButton or not self.m_DragFlyout:
+            return
+        flyout, self.m_DragFlyout = self.m_DragFlyout, None
+        self.unsetCursor()
+        flyout.EndDrag()
+
+
+class OverlayMgr:
+    def __init__(self):
+        self.m_lFlyout: "List[Timer_Flyout]" = []  # 绘制顺序
+        self.m_lOverlay: "List[Timer_Overlay]" = []
+        self.m_bMaskDirty = False
+
+    def _MakeSureOverlay(self):
+        if self.m_lOverlay:
+            return
+        app = QGuiApplication.instance()
+        for screen in QGuiApplication.screens():
+            self.m_lOverlay.append(Timer_Overlay(screen))
+        app.screenAdded.connect(self._OnScreenChange)
+        app.screenRemoved.connect(self._OnScreenChange)
+
+    def _OnScreenChange(self, screen):
+        # 屏幕增减时重新创建窗口
+        for overlay in self.m_lOverlay:
+            overlay.close()
+        self.m_lOverlay = [Timer_Overlay(screen) for screen in QGuiApplication.screens()]
+        self._UpdateMask()
+
+    def Add(self, flyout):
+        self._MakeSureOverlay()
+        if flyout in self.m_lFlyout:
+            return
+        self.m_lFlyout.append(flyout)
+        self.OnGeometryChange(QRect(), flyout.geometry())
+
+    def Remove(self, flyout):
+        if flyout not in self.m_lFlyout:
+            return
+        self.m_lFlyout.remove(flyout)
+        self.OnGeometryChange(flyout.geometry(), QRect())
+
+    def Invalidate(self, rect: QRect):
+        for overlay in self.m_lOverlay:
+            overlay.UpdateRect(rect)
+
+    def OnGeometryChange(self, oldRect: QRect, newRect: QRect):
+        # 移动或改变大小: 新旧区域都要重绘, 遮罩在下一次事件循环统一更新
+        self.Invalidate(oldRect)
+        self.Invalidate(newRect)
+        if not self.m_bMaskDirty:
+            self.m_bMaskDirty = True
+            QTimer.singleShot(0, self._UpdateMask)
+
+    def _UpdateMask(self):
+        self.m_bMaskDirty = False
+        for overlay in self.m_lOverlay:
+            overlay.UpdateMask()
+
+
+if "g_Instance" not in globals():
+    g_Instance = OverlayMgr()
+
+# ------------------- api --------------------
+Add = g_Instance.Add
+Remove = g_Instance.Remove
+Invalidate = g_Instance.Invalidate
+OnGeometryChange = g_Instance.OnGeometryChange
@@ -0,0 +1,187 @@
+# --*utf-8*--
+# Author：一念断星河
+# Crete Data：2026/10/19
+# Desc：不过是大梦一场空，不过是孤影照惊鸿。
+# 定时器绘制缓存: 颜色画刷只创建一次, 背景/图标/边框预先合成图层, 倒计时文字从字形图集中贴图
+import math
+import re
+from collections import OrderedDict
+
+from PySide6.QtCore import *
+from PySide6.QtGui import *
+
+MaxAtlas = 32  # 字形图集数量(字体 x 颜色 x 设备像素比)
+SweepSteps = 360  # 冷却扫描的角度精度, 每个尺寸最多缓存这么多路径
+MaxSweepSize = 16  # 缓存扫描路径的尺寸数量
+MaxRuns = 256  # 每个图集缓存的文本拆分结果数量
+# 数字和分隔符逐字贴图, 其余连续的文字(提示、单位、就绪文本)整段渲染, 保留段内的字距调整
+g_RunPattern = re.compile(r"[0-9:. -]|[^0-9:. -]+")
+
+if "g_Brushes" not in globals():
+    g_Brushes = {}  # 颜色字符串 -> QBrush
+    g_Atlas = OrderedDict()  # (字体, 颜色, 设备像素比) -> GlyphAtlas
+    g_Metrics = {}  # 字体 -> (QFontMetrics, 最宽的数字)
+    g_SweepPaths = OrderedDict()  # (宽, 高) -> {角度步数: 扇形路径}
+
+
+def GetBrush(sColor):
+    brush = g_Brushes.get(sColor, None)
+    if brush is None:
+        brush = g_Brushes[sColor] = QBrush(QColor(sColor))
+    return brush
+
+
+def GetMetrics(font):
+    """
+    :return: (字体度量, 该字体下最宽的数字)
+    """
+    key = font.key()
+    cache = g_Metrics.get(key, None)
+    if cache is None:
+        metrics = QFontMetrics(font)
+        cache = g_Metrics[key] = (metrics, max("0123456789", key=metrics.horizontalAdvance))
+    return cache
+
+
+class GlyphAtlas:
+    """
+    单个字体和颜色的字形图集: 每个字符第一次出现时渲染成图片, 之后直接贴图
+    倒计时只有数字在变, 绘制时不再需要排版文字
+    文字段按整段缓存, 只有数字和相邻文字之间没有字距调整
+    """
+
+    def __init__(self, font, sColor, dpr):
+        self.m_Font = QFont(font)
+        self.m_Color = QColor(sColor)
+        self.m_Dpr = dpr
+        metrics = QFontMetricsF(self.m_Font)
+        self.m_fAscent = metrics.ascent()
+        self.m_fHeight = metrics.height()
+        self.m_Metrics = metrics
+        self.m_dGlyph = {}  # 字符或整段文字 -> (图片, 步进宽度, 左边留白)
+        self.m_dRuns = {}  # 文本 -> 拆分后的字符和文字段
+
+    def _GetGlyph(self, ch):
+        glyph = self.m_dGlyph.get(ch, None)
+        if glyph:
+            return glyph
+        fAdvance = self.m_Metrics.horizontalAdvance(ch)
+        # 斜体等字形可能超出步进宽度, 两边各留一点
+        iPad = 2
+        w = math.ceil(fAdvance) + iPad * 2
+        h = math.ceil(self.m_fHeight)
+        pixmap = QPixmap(max(1, round(w * self.m_Dpr)), max(1, round(h * self.m_Dpr)))
+        pixmap.setDevicePixelRatio(self.m_Dpr)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.TextAntialiasing, True)
+        painter.setFont(self.m_Font)
+        painter.setPen(self.m_Color)
+        painter.drawText(QPointF(iPad, self.m_fAscent), ch)
+        painter.end()
+        glyph = self.m_dGlyph[ch] = (pixmap, fAdvance, iPad)
+        return glyph
+
+    def _GetRuns(self, sText):
+        lRun = self.m_dRuns.get(sText, None)
+        if lRun is None:
+            if len(self.m_dRuns) > MaxRuns:
+                self.m_dRuns.clear()
+            lRun = self.m_dRuns[sText] = g_RunPattern.findall(sText)
+        return lRun
+
+    def Width(self, sText):
+        return sum(self._GetGlyph(sRun)[1] for sRun in self._GetRuns(sText))
+
+    def Draw(self, painter, rect, sText):
+        # 在 rect 中居中绘制
+        if not sText:
+            return
+        x = rect.x() + (rect.width() - self.Width(sText)) / 2
+        y = rect.y() + (rect.height() - self.m_fHeight) / 2
+        for sRun in self._GetRuns(sText):
+            pixmap, fAdvance, iPad = self._GetGlyph(sRun)
+            painter.drawPixmap(QPointF(x - iPad, y), pixmap)
+            x += fAdvance
+
+
+def GetAtlas(font, sColor, dpr):
+    key = (font.key(), sColor, dpr)
+    atlas = g_Atlas.get(key, None)
+    if atlas is None:
+        atlas = g_Atlas[key] = GlyphAtlas(font, sColor, dpr)
+        while len(g_Atlas) > MaxAtlas:
+            g_Atlas.popitem(last=False)
+    else:
+        g_Atlas.move_to_end(key)
+    return atlas
+
+
+def _PixmapKey(pixmap):
+    return pixmap.cacheKey() if pixmap else 0
+
+
+class LayerCache:
+    """
+    图标定时器的静态图层: 就绪(背景+图标+边框)和冷却中(背景+遮罩或变暗的图标+边框)
+    配置或尺寸变化时重新合成, 每帧只需要贴一张图
+    """
+
+    def __init__(self):
+        self.m_Key = None
+        self.m_ReadyLayer = None
+        self.m_CoolLayer = None
+
+    def GetLayer(self, flyout, bCooling, dpr):
+        proxy = flyout.timerInfoProxy
+        size = flyout.size()
+        key = (size.width(), size.height(), dpr, proxy.m_bgColor, proxy.m_boardColor, proxy.m_iBoardSize,
+               _PixmapKey(flyout._Pixmap), _PixmapKey(flyout._MaskPixmap))
+        if key != self.m_Key:
+            self.m_Key = key
+            self.m_ReadyLayer = None
+            self.m_CoolLayer = None
+        if bCooling:
+            if self.m_CoolLayer is None:
+                self.m_CoolLayer = self._Compose(flyout, size, dpr, True)
+            return self.m_CoolLayer
+        if self.m_ReadyLayer is None:
+            self.m_ReadyLayer = self._Compose(flyout, size, dpr, False)
+        return self.m_ReadyLayer
+
+    @staticmethod
+    def _Compose(flyout, size, dpr, bCooling):
+        pixmap = QPixmap(max(1, round(size.width() * dpr)), max(1, round(size.height() * dpr)))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        flyout.PaintLayer(painter, QRect(QPoint(0, 0), size), bCooling)
+        painter.end()
+        return pixmap
+
+
+def GetSweepPath(w, h, fRemain):
+    """
+    冷却扫描的扇形区域: 从12点方向开始, 剩余部分逆时针展开, 随时间顺时针收缩
+    :param fRemain: 剩余比例 0~1
+    :return: 以(0, 0)为左上角的路径
+    """
+    iStep = max(0, min(SweepSteps, math.ceil(fRemain * SweepSteps)))
+    key = (w, h)
+    dPath = g_SweepPaths.get(key, None)
+    if dPath is None:
+        dPath = g_SweepPaths[key] = {}
+        while len(g_SweepPaths) > MaxSweepSize:
+            g_SweepPaths.popitem(last=False)
+    else:
+        g_SweepPaths.move_to_end(key)
+    path = dPath.get(iStep, None)
+    if path is None:
+        # 半径取对角线的一半, 扇形能盖住整个矩形
+        fRadius = math.hypot(w, h) / 2
+        cx, cy = w / 2, h / 2
+        path = QPainterPath(QPointF(cx, cy))
+        path.arcTo(QRectF(cx - fRadius, cy - fRadius, fRadius * 2, fRadius * 2), 90, iStep * 360 / SweepSteps)
+        path.closeSubpath()
+        dPath[iStep] = path
+    return path
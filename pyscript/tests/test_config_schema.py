@@ -0,0 +1,61 @@
+# --*utf-8*--
+# Author：一念断星河
+# Crete Data：2026/10/19
+# Desc：不过是大梦一场空，不过是孤影照惊鸿。
+# 存档迁移后再复制进旧格式的存档, 版本号跟着变旧, 加载时仍要校验
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+pytest.importorskip("PySide6")
+
+from core import core_save  # noqa: E402
+from core.core_define import Path_Timer  # noqa: E402
+from logic.helper import config_schema  # noqa: E402
+
+
+def test_load_legacy_doc_after_version_stamp(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(core_save, "g_WriteStamp", {})
+    core_save.SetProfile("")
+    config_schema.Migrate()
+    sReal = core_save.ResolvePath(Path_Timer)
+    assert core_save.LoadItem(Path_Timer, config_schema.VersionKey) == config_schema.SchemaVersion
+    assert config_schema.LoadDoc(Path_Timer) == {}
+
+    # 从其他电脑复制过来的旧格式存档: 缺字段, 热键只有一组
+    with open(sReal, "w", encoding="utf-8") as f:
+        json.dump({"1": {"sName": "旧定时器", "lKeyCode": ["f1"]}}, f)
+
+    data, lazy_data = config_schema.LoadLazy(Path_Timer)
+    item = data["1"]
+    assert item["lKeyCode"] == [["f1"]]
+    assert item["iTime"] == 3
+    assert item["bTenths"] is False
+    assert config_schema.LoadItem(Path_Timer, 1) == item
+    assert config_schema.LoadItem(Path_Timer, 2) == config_schema.NewItem(Path_Timer)
+    assert config_schema.LoadDoc(Path_Timer) == data
+
+
+def test_invalid_int_uses_field_default():
+    item = config_schema.ValidateItem(Path_Timer, {"iConSize": "abc", "iFontSize": None, "groupId": [], "iTime": 99999})
+    assert item["iConSize"] == 50
+    assert item["iFontSize"] == 18
+    assert item["groupId"] == 0
+    assert item["iTime"] == 24 * 3600
+
+
+def test_current_doc_skips_validation(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(core_save, "g_WriteStamp", {})
+    core_save.SetProfile("")
+    item = config_schema.NewItem(Path_Timer)
+    core_save.SaveJson(Path_Timer, {"1": item, config_schema.VersionKey: config_schema.SchemaVersion})
+    # 已是最新版本的存档原样返回, 不再逐字段校验
+    monkeypatch.setattr(config_schema, "ValidateDoc", None)
+    monkeypatch.setattr(config_schema, "ValidateItem", None)
+    assert config_schema.LoadDoc(Path_Timer) == {"1": item}
+    assert config_schema.LoadLazy(Path_Timer) == ({"1": item}, {})
@@ -0,0 +1,43 @@
+# --*utf-8*--
+# Author：一念断星河
+# Crete Data：2026/10/19
+# Desc：不过是大梦一场空，不过是孤影照惊鸿。
+# 冷却的暂停、继续、重置只作用于正在倒计时的集合
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import core_cooldown  # noqa: E402
+
+
+def test_pause_resume_reset(monkeypatch):
+    monkeypatch.setattr(core_cooldown, "g_Instance", core_cooldown.CooldownMgr())
+    lTick, lEnd = [], []
+    ref = core_cooldown.StartCooldown("a", 1000, lTick.append, lambda: lEnd.append(1))
+    assert core_cooldown.g_Instance.IsActive("a")
+
+    core_cooldown.UpdateCooldown(300)
+    assert core_cooldown.GetCooldownRemain("a") == 700
+    assert lTick == [700]
+
+    # 暂停期间不减少剩余时间, 也不回调
+    core_cooldown.PauseCooldown("a")
+    assert core_cooldown.g_Instance.IsPause("a")
+    core_cooldown.UpdateCooldown(500)
+    assert core_cooldown.GetCooldownRemain("a") == 700
+    assert lTick == [700]
+
+    core_cooldown.PauseCooldown("a", False)
+    core_cooldown.UpdateCooldown(200)
+    assert core_cooldown.GetCooldownRemain("a") == 500
+
+    # 重置从头开始, 不触发结束回调
+    core_cooldown.ResetCooldown("a")
+    assert core_cooldown.GetCooldownRemain("a") == 1000
+    assert lEnd == []
+    core_cooldown.UpdateCooldown(1000)
+    assert lEnd == [1]
+    assert not core_cooldown.g_Instance.IsActive("a")
+    assert core_cooldown.GetCooldownRemain("a") == 0
+    del ref
@@ -0,0 +1,85 @@
+# --*utf-8*--
+# Author：一念断星河
+# Crete Data：2026/10/19
+# Desc：不过是大梦一场空，不过是孤影照惊鸿。
+# 快照被外部替换后, 基于旧快照的本地日志不能再重放
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import core_save  # noqa: E402
+from core.core_define import Path_Timer  # noqa: E402
+
+
+def test_external_change_drops_stale_journal(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(core_save, "g_WriteStamp", {})
+    monkeypatch.setattr(core_save, "g_CompactTime", {})
+    core_save.SetProfile("")
+    core_save.SaveJson(Path_Timer, {"1": {"sName": "a"}, "2": {"sName": "b"}})
+    core_save.SaveField(Path_Timer, "1", {"sName": "本地"})
+    core_save.SaveField(Path_Timer, "2", {"sName": "本地"})
+    assert core_save.LoadJson(Path_Timer)["1"]["sName"] == "本地"
+
+    # 同步过来的新快照删除了2, 修改了1
+    sReal = core_save.ResolvePath(Path_Timer)
+    with open(sReal, "w", encoding="utf-8") as f:
+        json.dump({"1": {"sName": "同步"}}, f)
+    os.utime(sReal, ns=(0, 0))
+    assert core_save.IsExternalChange(Path_Timer)
+
+    assert core_save.LoadJson(Path_Timer) == {"1": {"sName": "同步"}}
+    assert not os.path.exists(sReal + core_save.JournalSuffix)
+
+
+def test_journal_replayed_on_startup(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(core_save, "g_WriteStamp", {})
+    monkeypatch.setattr(core_save, "g_CompactTime", {})
+    core_save.SetProfile("")
+    core_save.SaveJson(Path_Timer, {})
+    core_save.SaveField(Path_Timer, "1", {"sName": "新建"})
+
+    # 重启后没有读取记录, 日志是崩溃前未合并的改动
+    monkeypatch.setattr(core_save, "g_WriteStamp", {})
+    assert core_save.LoadJson(Path_Timer) == {"1": {"sName": "新建"}}
+
+
+def test_snapshot_accepted_on_main_thread(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(core_save, "g_WriteStamp", {})
+    monkeypatch.setattr(core_save, "g_CompactTime", {})
+    core_save.SetProfile("")
+    core_save.SaveJson(Path_Timer, {"1": {"sName": "a"}})
+    core_save.SaveField(Path_Timer, "1", {"sName": "本地"})
+    monkeypatch.setattr(core_save, "g_WriteStamp", {})
+
+    # 后台读取只拿到快照, 不记录文件状态
+    data, stamp = core_save.LoadSnapshot(Path_Timer)
+    assert data == {"1": {"sName": "a"}}
+    assert core_save.g_WriteStamp == {}
+    assert stamp == core_save.FileStamp(Path_Timer)
+
+    assert core_save.AcceptSnapshot(Path_Timer, data, stamp) == {"1": {"sName": "本地"}}
+    assert not core_save.IsExternalChange(Path_Timer)
+
+
+def test_compact_keeps_external_change(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(core_save, "g_WriteStamp", {})
+    monkeypatch.setattr(core_save, "g_CompactTime", {})
+    core_save.SetProfile("")
+    core_save.SaveJson(Path_Timer, {"1": {"sName": "a"}})
+    core_save.SaveField(Path_Timer, "1", {"sName": "本地"})
+    sReal = core_save.ResolvePath(Path_Timer)
+    with open(sReal, "w", encoding="utf-8") as f:
+        json.dump({"2": {"sName": "同步"}}, f)
+    os.utime(sReal, ns=(0, 0))
+
+    # 外部修改还没被重新加载时不合并, 文件保持外部修改的内容
+    core_save.Compact(Path_Timer)
+    assert core_save.IsExternalChange(Path_Timer)
+    with open(sReal, "r", encoding="utf-8") as f:
+        assert json.load(f) == {"2": {"sName": "同步"}}
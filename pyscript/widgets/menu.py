@@ -256,6 +256,7 @@ class RoundMenu(QMenu):
 		self.lastHoverSubMenuItem = None
 		self.isHideBySystem = True
 		self.itemHeight = 28
+		self._lazyContent = None
 		
 		self.hBoxLayout = QHBoxLayout(self)
 		self.view = MenuActionListWidget(self)
@@ -267,6 +268,64 @@ class RoundMenu(QMenu):
 
 	def DeepClose(self):
 		self._closeParentMenu()
+
+	def setLazyContent(self, func):
+		""" build the content of menu on first show, `func(menu)` """
+		self._lazyContent = func
+
+	def ensureContent(self):
+		""" build the lazy content now """
+		if not self._lazyContent:
+			return
+		func, self._lazyContent = self._lazyContent, None
+		func(self)
+
+	def isContentBuilt(self):
+		return self._lazyContent is None
+
+	def setTitle(self, title: str):
+		""" set the title of menu and update its item in parent menu """
+		self._title = title
+		parent = self.parentMenu
+		if not parent or not self.menuItem:
+			return
+		
+		if not parent._hasItemIcon():
+			text = title
+			w = 60 + parent.view.fontMetrics().boundingRect(text).width()
+		else:
+			text = " " + title
+			w = 72 + parent.view.fontMetrics().boundingRect(text).width()
+		
+		self.menuItem.setText(text)
+		self.menuItem.setSizeHint(QSize(w, parent.itemHeight))
+		widget = parent.view.itemWidget(self.menuItem)
+		if widget:
+			widget.resize(self.menuItem.sizeHint())
+		parent.view.adjustSize()
+		parent.adjustSize()
+
+	def takeItemsFrom(self, row: int):
+		""" remove the items from `row` to the end, sub menus are kept for reuse """
+		while self.view.count() > row:
+			index = self.view.count() - 1
+			item = self.view.item(index)
+			data = item.data(Qt.UserRole)
+			if isinstance(data, RoundMenu):
+				if data in self._subMenus:
+					self._subMenus.remove(data)
+			elif isinstance(data, QAction) and data in self._actions:
+				self._actions.remove(data)
+				data.setProperty('item', None)
+				super().removeAction(data)
+			
+			widget = self.view.itemWidget(item)
+			item.setData(Qt.UserRole, None)
+			self.view.takeItem(index)
+			if widget:
+				widget.deleteLater()
+		
+		self.adjustSize()
 	
 	def __initWidgets(self):
 		self.setWindowFlags(Qt.Popup | Qt.FramelessWindowHint |
@@ -701,6 +760,7 @@ class RoundMenu(QMenu):
 		aniType: MenuAnimationType
 			menu animation type
 		"""
+		self.ensureContent()
 		if self.isVisible():
 			aniType = MenuAnimationType.NONE
 		self.aniManager = MenuAnimationManager.make(self, aniType)